@@ -1,23 +1,23 @@
-import json
+import textwrap
+import ijson
+import orjson
 
-# Load data
-with open('backend/data/indian_gym_friendly_nutrition_rag_dataset_TOP_NOTCH_v5.1.json', 'r', encoding='utf-8') as f:
-    data = json.load(f)
+DATASET_PATH = 'backend/data/indian_gym_friendly_nutrition_rag_dataset_TOP_NOTCH_v5.1.json'
 
-meals = data.get('meals', [])
-
-# Get unique lunch items as base for dinner
-lunch_meals = [m for m in meals if m.get('meal_type') == 'lunch']
+# Stream meals and stop as soon as we have 10 lunch items as base for dinner
+lunch_meals = []
+with open(DATASET_PATH, 'rb') as f:
+    for m in ijson.items(f, 'meals.item', use_float=True):
+        if m.get('meal_type') == 'lunch':
+            lunch_meals.append(m)
+            if len(lunch_meals) == 10:
+                break
 
 # Create dinner versions from lunch items
-dinner_meals = []
-dinner_id = 200
-for m in lunch_meals[:10]:
-    dm = dict(m)
-    dm['meal_type'] = 'dinner'
-    dm['meal_id'] = f'TOP_MEAL_{dinner_id}'
-    dinner_id += 1
-    dinner_meals.append(dm)
+dinner_meals = [
+    {**m, 'meal_type': 'dinner', 'meal_id': f'TOP_MEAL_{200 + i}'}
+    for i, m in enumerate(lunch_meals[:10])
+]
 
 # Create snack items
 snack_meals = [
@@ -87,16 +87,48 @@ snack_meals = [
     }
 ]
 
-# Add new meals to data
-data['meals'].extend(dinner_meals)
-data['meals'].extend(snack_meals)
+# Splice new meals into the end of the "meals" array instead of rewriting the dataset
+new_meals = dinner_meals + snack_meals
 
-# Save updated data
-with open('backend/data/indian_gym_friendly_nutrition_rag_dataset_TOP_NOTCH_v5.1.json', 'w', encoding='utf-8') as f:
-    json.dump(data, f, indent=2, ensure_ascii=False)
+with open(DATASET_PATH, 'r+b') as f:
+    f.seek(0, 2)
+    tail_start = max(0, f.tell() - 4096)
+    f.seek(tail_start)
+    tail = f.read()
+    
+    # The splice needs "meals" to be the last key: only "]" then "}" may follow the last item
+    array_end = tail.rindex(b']')
+    if tail[array_end + 1:].strip() != b'}':
+        raise SystemExit('"meals" is not the last key of the dataset; refusing to splice')
+    last_item_end = len(tail[:array_end].rstrip())
+    
+    # Match the file's own newline sequence and item indentation (taken from the existing tail)
+    newline = b'\r\n' if b'\r\n' in tail else b'\n'
+    if tail[last_item_end - 1:last_item_end] == b'[':
+        # Empty array: indent items one level (2 spaces) deeper than the closing bracket
+        bracket_line = tail[tail.rfind(b'\n', 0, array_end) + 1:array_end]
+        indent = bracket_line + b'  '
+        separator = newline
+    else:
+        last_line = tail[tail.rfind(b'\n', 0, last_item_end) + 1:last_item_end]
+        indent = last_line[:len(last_line) - len(last_line.lstrip())]
+        separator = b',' + newline
+    
+    new_entries = (b',' + newline).join(
+        textwrap.indent(orjson.dumps(m, option=orjson.OPT_INDENT_2).decode(), indent.decode()).encode().replace(b'\n', newline)
+        for m in new_meals
+    )
+    
+    # Keep the original closing bytes ("]", "}" and whatever whitespace/newlines surround them)
+    closing = tail[last_item_end:]
+    f.seek(tail_start + last_item_end)
+    f.write(separator + new_entries + closing)
+    f.truncate()
 
 # Verify
-types = set(m.get('meal_type') for m in data['meals'])
+with open(DATASET_PATH, 'rb') as f:
+    all_types = list(ijson.items(f, 'meals.item.meal_type'))
+types = set(all_types)
 print(f'Updated meal types: {types}')
-print(f'Total meals now: {len(data["meals"])}')
+print(f'Total meals now: {len(all_types)}')
 print(f'Added {len(dinner_meals)} dinners and {len(snack_meals)} snacks.')
@@ -6,39 +6,279 @@ Implements the hierarchical "Hub and Spoke" workflow from README.md.
 """
 
 import os
-import json
+import time
+import atexit
+import logging
+import orjson
+import msgspec
 import hashlib
-from datetime import datetime
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import google.generativeai as genai
-from typing import Dict, Any
+import typing_extensions as typing
+from diskcache import Cache
+from typing import Dict, Any, Optional, Union
 from dotenv import load_dotenv
 
+# xxhash is only used for the (non-cryptographic) cache key; blake2b is the fallback
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configure Gemini API
 api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
 if api_key:
     genai.configure(api_key=api_key)
 
+
+# Schema for the Manager's JSON reply (enforced by Gemini's JSON mode); mirrors ManagerPlan below
+class ManagerPlanSchema(typing.TypedDict):
+    workout: str
+    intensity: str
+    duration: str
+    workout_rationale: str
+    calories: int
+    protein: int
+    carbs: int
+    fat: int
+    pre_workout_meal: str
+    post_workout_meal: str
+    conflict_detected: bool
+    conflict_description: str
+    final_decision: str
+
+
+# Decoded Manager reply; numeric fields left as None fall back to the user's profile targets
+class ManagerPlan(msgspec.Struct):
+    workout: str = 'Active Recovery'
+    intensity: str = 'Low'
+    duration: str = '30 minutes'
+    workout_rationale: str = 'Respecting current readiness'
+    calories: Optional[int] = None
+    protein: Optional[int] = None
+    carbs: Union[int, str] = 'N/A'
+    fat: Union[int, str] = 'N/A'
+    pre_workout_meal: str = 'Light meal 2h before'
+    post_workout_meal: str = 'Protein-rich meal'
+    conflict_detected: bool = False
+    conflict_description: str = ''
+    final_decision: Optional[str] = None
+
+
+_PLAN_DECODER = msgspec.json.Decoder(ManagerPlan, strict=False)
+
+
+def _decode_plan(text: str) -> ManagerPlan:
+    """
+    Decode the Manager reply into a ManagerPlan.
+    ManagerPlanSchema (sent to Gemini) and ManagerPlan are kept by hand, so if a value's type
+    drifts from ManagerPlan, only that field falls back to its default instead of the whole reply.
+    """
+    try:
+        return _PLAN_DECODER.decode(text)
+    except msgspec.ValidationError:
+        pass
+    
+    raw = orjson.loads(text)
+    if not isinstance(raw, dict):
+        raise ValueError("Manager reply is not a JSON object")
+    
+    values = {}
+    for field in msgspec.structs.fields(ManagerPlan):
+        if field.name not in raw:
+            continue
+        try:
+            values[field.name] = msgspec.convert(raw[field.name], field.type, strict=False)
+        except msgspec.ValidationError:
+            logger.warning("Manager reply field %r has an unexpected type, using default", field.name)
+    return ManagerPlan(**values)
+
+
+# Use the same model as other agents (built once, reused across briefings)
+_MODEL = genai.GenerativeModel(
+    'gemini-2.5-flash',
+    generation_config={
+        "response_mime_type": "application/json",
+        "response_schema": ManagerPlanSchema
+    }
+) if api_key else None
+
 # Import existing functions
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Cache for daily briefings (in-memory, per-process)
-_briefing_cache = {}
+# Cache for daily briefings (on disk, survives worker restarts)
+_briefing_cache = Cache(
+    os.environ.get("BRIEFING_CACHE_DIR", os.path.join(tempfile.gettempdir(), "triad_briefings")),
+    size_limit=int(1e8)
+)
+
+# Briefings are keyed by date, so nothing older than a day is ever read again
+BRIEFING_CACHE_TTL = 86400
+
+
+# Manager prompt, rendered per request with format_map
+_PROMPT_TMPL = """You are the Manager Agent (Head Coach) coordinating a team of specialist agents.
+
+**WELLNESS AGENT REPORT:**
+- Readiness Score: {readiness_score}/100
+- Sleep: {sleep_hours}h
+- HRV: {hrv} ms
+- RHR: {rhr} bpm
+
+**USER PROFILE:**
+- Goal Phase: {phase}
+- Daily Calories: {calories} kcal
+- Protein Target: {protein_target}g
+{user_suggestions_section}
+**YOUR TASK:**
+As the Manager, synthesize a Daily Briefing that coordinates:
+1. Workout recommendation (adjust intensity based on readiness)
+2. Nutrition plan (aligned with workout and phase)
+3. Conflict detection (if readiness conflicts with phase goals)
+
+**RULES:**
+- If readiness < 60: OVERRIDE to active recovery regardless of phase
+- If readiness 60-79: Moderate intensity
+- If readiness >= 80: High intensity allowed
+- Nutrition stays at base calories ± 200 based on workout
+- If user provided override preferences, incorporate them while respecting safety
+
+**OUTPUT (strict JSON, no markdown):**
+{{
+  "workout": "Specific workout name (e.g., 'Upper Body Hypertrophy' or 'Active Recovery Walk')",
+  "intensity": "Low/Medium/High",
+  "duration": "X minutes",
+  "workout_rationale": "Brief reasoning for this workout choice",
+  "calories": "Total daily calories as integer",
+  "protein": "Protein grams as integer",
+  "carbs": "Carbs grams as integer",
+  "fat": "Fat grams as integer",
+  "pre_workout_meal": "Specific meal suggestion",
+  "post_workout_meal": "Specific meal suggestion",
+  "conflict_detected": true/false,
+  "conflict_description": "Description if conflict exists, otherwise empty string",
+  "final_decision": "One sentence summary of the unified plan"
+}}
+"""
+
+
+# Safe-default briefing used when Gemini fails; per-user fields are filled in at runtime
+_FALLBACK_BRIEFING = {
+    "status": "success",
+    "briefing_date": "today",
+    "wellness_assessment": {
+        "readiness_score": None,
+        "sleep_hours": None,
+        "state": "Moderate",
+        "hrv": "Normal",
+        "stress_level": "Moderate"
+    },
+    "workout_plan": {
+        "workout": "Moderate Strength Training",
+        "intensity": "Medium",
+        "duration": "45 minutes",
+        "rationale": "Balanced approach for current state"
+    },
+    "nutrition_plan": {
+        "total_calories": None,
+        "protein": None,
+        "carbs": "N/A",
+        "fat": "N/A",
+        "pre_workout": "Light meal 2h before",
+        "post_workout": "Protein-rich meal"
+    },
+    "conflicts": [],
+    "final_decision": {
+        "summary": None,
+        "priority": "Balanced approach"
+    }
+}
+
+
+def _as_int(value, default: int) -> int:
+    """Coerce a number from the LLM or a stored profile (int, float or numeric string) to int."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return int(default)
+
+
+@lru_cache(maxsize=2)
+def _today_str(local_date: tuple) -> str:
+    """Date string for a local (year, month, day) tuple, formatted once per day."""
+    return "%04d-%02d-%02d" % local_date
 
 
 def _get_cache_key(user_id: str, wellness_data: dict, profile: dict) -> str:
     """Generate cache key based on user_id, date, and data state."""
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = _today_str(time.localtime()[:3])
     
-    # Create hash of wellness + profile data
-    data_str = f"{wellness_data}{profile}"
-    data_hash = hashlib.md5(data_str.encode()).hexdigest()[:8]
+    # Hash a canonical (key-sorted) encoding so equal data always maps to the same key
+    payload = orjson.dumps({"w": wellness_data, "p": profile}, option=orjson.OPT_SORT_KEYS)
+    if xxhash is not None:
+        data_hash = xxhash.xxh64_hexdigest(payload)
+    else:
+        data_hash = hashlib.blake2b(payload, digest_size=8).hexdigest()
     
     return f"{user_id}_{today}_{data_hash}"
 
 
+# Background pool for profile writes so Pinecone latency stays off the response path
+_UPSERT_POOL = ThreadPoolExecutor(max_workers=4)
+atexit.register(lambda: _UPSERT_POOL.shutdown(wait=True))
+
+
+def _persist_profile(user_id: str, manager_calories: int, manager_protein: int, phase: str) -> None:
+    """Embed and upsert a manager-adjusted profile (runs on _UPSERT_POOL)."""
+    from backend.tools.memory_store import _get_index, _get_cached_embedding
+    
+    try:
+        logger.info("💾 Manager updating profile: calories=%s, protein=%s", manager_calories, manager_protein)
+        
+        # Create updated profile document
+        profile_text = f"""User Fitness Profile (Manager Updated):
+Daily Calorie Target: {manager_calories} kcal
+Current Phase: {phase}
+Protein Target: {manager_protein}g per day
+
+Manager adjusted nutrition based on today's readiness and workout plan.
+"""
+        
+        # Get embedding (identical profile texts reuse the cached vector)
+        profile_vector = _get_cached_embedding(profile_text)
+        
+        # Prepare metadata
+        now = int(time.time())
+        profile_metadata = {
+            "type": "user_profile",
+            "calories": manager_calories,
+            "phase": phase,
+            "protein_target": manager_protein,
+            "notes": f"Manager-adjusted on {_today_str(time.localtime(now)[:3])}",
+            "created_timestamp": now,
+            "text": profile_text
+        }
+        
+        # Store in Pinecone
+        index = _get_index()
+        profile_vector_id = f"profile_{user_id}_{now}"
+        
+        index.upsert(
+            vectors=[(profile_vector_id, profile_vector, profile_metadata)],
+            namespace=user_id
+        )
+        
+        logger.debug("✅ Profile updated by Manager Agent")
+    except Exception as e:
+        logger.warning("⚠️ Failed to update profile: %s", e)
+
 
 def generate_daily_briefing(user_id: str, force_regenerate: bool = False, user_suggestions: str = None) -> Dict[str, Any]:
     """
@@ -52,18 +292,21 @@ def generate_daily_briefing(user_id: str, force_regenerate: bool = False, user_s
     If user_suggestions is provided, it will be incorporated into the AI prompt
     and the cache will be bypassed.
     """
-    global _briefing_cache
-    
     from backend.server import get_user_profile
-    from backend.tools.memory_store import get_wellness_memory, _get_index, _get_embeddings
-    import time
+    from backend.tools.memory_store import get_wellness_memory
     
     # Force regenerate if user provided suggestions
     if user_suggestions:
         force_regenerate = True
     
+    # STEP 1-2: Fetch wellness logs and user profile concurrently (independent Pinecone queries)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        wellness_future = executor.submit(get_wellness_memory, query="recent wellness readiness biometrics", top_k=1, user_id=user_id)
+        profile_future = executor.submit(get_user_profile, user_id=user_id)
+        wellness_logs = wellness_future.result()
+        profile = profile_future.result() or {}
+    
     # STEP 1: Collect Wellness Data
-    wellness_logs = get_wellness_memory(query="recent wellness readiness biometrics", top_k=1, user_id=user_id)
     
     wellness_data = {}
     if wellness_logs and len(wellness_logs) > 0:
@@ -82,7 +325,6 @@ def generate_daily_briefing(user_id: str, force_regenerate: bool = False, user_s
         wellness_data = {'readiness_score': readiness_score, 'sleep_hours': sleep_hours, 'hrv': hrv, 'rhr': rhr}
     
     # STEP 2: Get User Profile
-    profile = get_user_profile(user_id=user_id) or {}
     calories = profile.get('calories', 2000)
     phase = profile.get('phase', 'maintenance')
     protein_target = profile.get('protein_target', 150)
@@ -90,14 +332,13 @@ def generate_daily_briefing(user_id: str, force_regenerate: bool = False, user_s
     # STEP 3: Check Cache
     cache_key = _get_cache_key(user_id, wellness_data, profile)
     
-    if not force_regenerate and cache_key in _briefing_cache:
-        print(f"📦 Using cached manager briefing for {user_id} (key: {cache_key})")
-        return _briefing_cache[cache_key]
+    if not force_regenerate:
+        cached_briefing = _briefing_cache.get(cache_key)
+        if cached_briefing is not None:
+            logger.debug("📦 Using cached manager briefing for %s (key: %s)", user_id, cache_key)
+            return cached_briefing
     
-    print(f"🔄 Generating new manager briefing for {user_id}")
-    
-    # Use the same model as other agents
-    model = genai.GenerativeModel('gemini-2.5-flash')
+    logger.info("🔄 Generating new manager briefing for %s", user_id)
     
     # STEP 4: Generate Unified Daily Plan using Manager Agent
     # Build user suggestions section if provided
@@ -109,56 +350,24 @@ The user has provided specific preferences that MUST be prioritized:
 "{user_suggestions}"
 You MUST incorporate these preferences into your plan while still maintaining safety guidelines.
 """
-        print(f"📝 User provided override suggestions: {user_suggestions}")
+        logger.info("📝 User provided override suggestions: %s", user_suggestions)
     
-    prompt = f"""You are the Manager Agent (Head Coach) coordinating a team of specialist agents.
-
-**WELLNESS AGENT REPORT:**
-- Readiness Score: {readiness_score}/100
-- Sleep: {sleep_hours}h
-- HRV: {hrv} ms
-- RHR: {rhr} bpm
-
-**USER PROFILE:**
-- Goal Phase: {phase}
-- Daily Calories: {calories} kcal
-- Protein Target: {protein_target}g
-{user_suggestions_section}
-**YOUR TASK:**
-As the Manager, synthesize a Daily Briefing that coordinates:
-1. Workout recommendation (adjust intensity based on readiness)
-2. Nutrition plan (aligned with workout and phase)
-3. Conflict detection (if readiness conflicts with phase goals)
-
-**RULES:**
-- If readiness < 60: OVERRIDE to active recovery regardless of phase
-- If readiness 60-79: Moderate intensity
-- If readiness >= 80: High intensity allowed
-- Nutrition stays at base calories ± 200 based on workout
-- If user provided override preferences, incorporate them while respecting safety
-
-**OUTPUT (strict JSON, no markdown):**
-{{
-  "workout": "Specific workout name (e.g., 'Upper Body Hypertrophy' or 'Active Recovery Walk')",
-  "intensity": "Low/Medium/High",
-  "duration": "X minutes",
-  "workout_rationale": "Brief reasoning for this workout choice",
-  "calories": "Total daily calories as integer",
-  "protein": "Protein grams as integer",
-  "carbs": "Carbs grams as integer",
-  "fat": "Fat grams as integer",
-  "pre_workout_meal": "Specific meal suggestion",
-  "post_workout_meal": "Specific meal suggestion",
-  "conflict_detected": true/false,
-  "conflict_description": "Description if conflict exists, otherwise empty string",
-  "final_decision": "One sentence summary of the unified plan"
-}}
-"""
+    prompt = _PROMPT_TMPL.format_map({
+        "readiness_score": readiness_score,
+        "sleep_hours": sleep_hours,
+        "hrv": hrv,
+        "rhr": rhr,
+        "phase": phase,
+        "calories": calories,
+        "protein_target": protein_target,
+        "user_suggestions_section": user_suggestions_section
+    })
     
     try:
-        response = model.generate_content(prompt)
-        clean_text = response.text.replace("```json", "").replace("```", "").strip()
-        plan = json.loads(clean_text)
+        response = _MODEL.generate_content(prompt)
+        plan = _decode_plan(response.text)
+        plan_calories = plan.calories if plan.calories is not None else calories
+        plan_protein = plan.protein if plan.protein is not None else protein_target
         
         # Categorize readiness
         if readiness_score >= 80:
@@ -185,11 +394,11 @@ As the Manager, synthesize a Daily Briefing that coordinates:
         
         # Build conflicts list
         conflicts = []
-        if plan.get('conflict_detected', False):
+        if plan.conflict_detected:
             conflicts.append({
                 "type": "Safety Override",
                 "source_agents": ["Wellness Agent", "Physical Trainer"],
-                "issue": plan.get('conflict_description', ''),
+                "issue": plan.conflict_description,
                 "resolution": "Manager adjusted plan to respect readiness"
             })
         
@@ -205,108 +414,65 @@ As the Manager, synthesize a Daily Briefing that coordinates:
                 "stress_level": stress_level
             },
             "workout_plan": {
-                "workout": plan.get('workout', 'Active Recovery'),
-                "intensity": plan.get('intensity', 'Low'),
-                "duration": plan.get('duration', '30 minutes'),
-                "rationale": plan.get('workout_rationale', 'Respecting current readiness')
+                "workout": plan.workout,
+                "intensity": plan.intensity,
+                "duration": plan.duration,
+                "rationale": plan.workout_rationale
             },
             "nutrition_plan": {
-                "total_calories": f"{plan.get('calories', calories)} kcal",
-                "protein": f"{plan.get('protein', protein_target)}g",
-                "carbs": f"{plan.get('carbs', 'N/A')}g",
-                "fat": f"{plan.get('fat', 'N/A')}g",
-                "pre_workout": plan.get('pre_workout_meal', 'Light meal 2h before'),
-                "post_workout": plan.get('post_workout_meal', 'Protein-rich meal')
+                "total_calories": f"{plan_calories} kcal",
+                "protein": f"{plan_protein}g",
+                "carbs": f"{plan.carbs}g",
+                "fat": f"{plan.fat}g",
+                "pre_workout": plan.pre_workout_meal,
+                "post_workout": plan.post_workout_meal
             },
             "conflicts": conflicts,
             "final_decision": {
-                "summary": plan.get('final_decision', f"{plan.get('workout', 'Recovery')} + {plan.get('calories', calories)} kcal"),
+                "summary": plan.final_decision if plan.final_decision is not None else f"{plan.workout} + {plan_calories} kcal",
                 "priority": "Safety first - Respecting wellness data"
             }
         }
         
         # STEP 5: Persist Manager Decisions to Profile
-        # Update user profile if manager adjusted calories/protein
-        manager_calories = plan.get('calories', calories)
-        manager_protein = plan.get('protein', protein_target)
+        # Update user profile only if manager meaningfully adjusted calories/protein
+        # (profile targets and LLM values may be floats or strings, so coerce both sides to ints)
+        profile_calories = _as_int(calories, 2000)
+        profile_protein = _as_int(protein_target, 150)
+        manager_calories = _as_int(plan_calories, profile_calories)
+        manager_protein = _as_int(plan_protein, profile_protein)
+        calories_changed = abs(manager_calories - profile_calories) > max(50, 0.02 * profile_calories)
+        protein_changed = abs(manager_protein - profile_protein) > max(5, 0.02 * profile_protein)
         
-        if manager_calories != calories or manager_protein != protein_target:
-            try:
-                print(f"💾 Manager updating profile: calories={manager_calories}, protein={manager_protein}")
-                
-                # Create updated profile document
-                profile_text = f"""User Fitness Profile (Manager Updated):
-Daily Calorie Target: {manager_calories} kcal
-Current Phase: {phase}
-Protein Target: {manager_protein}g per day
-
-Manager adjusted nutrition based on today's readiness and workout plan.
-"""
-                
-                # Get embedding
-                embeddings = _get_embeddings()
-                profile_vector = embeddings.embed_query(profile_text)
-                
-                # Prepare metadata
-                profile_metadata = {
-                    "type": "user_profile",
-                    "calories": int(manager_calories),
-                    "phase": phase,
-                    "protein_target": int(manager_protein),
-                    "notes": f"Manager-adjusted on {datetime.now().strftime('%Y-%m-%d')}",
-                    "created_timestamp": int(time.time()),
-                    "text": profile_text
-                }
-                
-                # Store in Pinecone
-                index = _get_index()
-                profile_vector_id = f"profile_{user_id}_{int(time.time())}"
-                
-                index.upsert(
-                    vectors=[(profile_vector_id, profile_vector, profile_metadata)],
-                    namespace=user_id
-                )
-                
-                print(f"✅ Profile updated by Manager Agent")
-            except Exception as e:
-                print(f"⚠️ Failed to update profile: {e}")
+        if calories_changed or protein_changed:
+            # Fire-and-forget: the briefing is ready, the profile write doesn't need to block it
+            _UPSERT_POOL.submit(_persist_profile, user_id, manager_calories, manager_protein, phase)
         
         # STEP 6: Cache the briefing
-        _briefing_cache[cache_key] = briefing
-        print(f"📦 Cached manager briefing with key: {cache_key}")
+        _briefing_cache.set(cache_key, briefing, expire=BRIEFING_CACHE_TTL)
+        logger.debug("📦 Cached manager briefing with key: %s", cache_key)
         
         return briefing
         
     except Exception as e:
-        print(f"❌ Manager Agent error: {e}")
+        logger.error("❌ Manager Agent error: %s", e)
         # Fallback to safe defaults
+        # Only the per-user sections are rebuilt; static sections are shared with the skeleton
         return {
-            "status": "success",
-            "briefing_date": "today",
+            **_FALLBACK_BRIEFING,
             "wellness_assessment": {
+                **_FALLBACK_BRIEFING["wellness_assessment"],
                 "readiness_score": readiness_score,
-                "sleep_hours": sleep_hours,
-                "state": "Moderate",
-                "hrv": "Normal",
-                "stress_level": "Moderate"
-            },
-            "workout_plan": {
-                "workout": "Moderate Strength Training",
-                "intensity": "Medium",
-                "duration": "45 minutes",
-                "rationale": "Balanced approach for current state"
+                "sleep_hours": sleep_hours
             },
             "nutrition_plan": {
+                **_FALLBACK_BRIEFING["nutrition_plan"],
                 "total_calories": f"{calories} kcal",
-                "protein": f"{protein_target}g",
-                "carbs": "N/A",
-                "fat": "N/A",
-                "pre_workout": "Light meal 2h before",
-                "post_workout": "Protein-rich meal"
+                "protein": f"{protein_target}g"
             },
             "conflicts": [],
             "final_decision": {
-                "summary": f"Moderate Training + {calories} kcal",
-                "priority": "Balanced approach"
+                **_FALLBACK_BRIEFING["final_decision"],
+                "summary": f"Moderate Training + {calories} kcal"
             }
         }
@@ -1,14 +1,12 @@
-import os
-import sys
-import json
-import random
+import atexit
+import orjson
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Add backend directory to path
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-
-from tools.memory_store import save_agent_memory
+from backend.tools.memory_store import save_agent_memory
+from backend.tools.chat_cache import chat_response_cache
 
 load_dotenv()
 
@@ -20,41 +18,106 @@ PROTEIN_BOOSTERS = [
     {"name": "Protein Bar", "protein": 20, "price": 100, "blinkit": "https://blinkit.com/s/?q=protien%20bar"}
 ]
 
+# Fresh items bought every day (counted in daily cost); the rest are one-time bulk purchases.
+# Kept parallel to PROTEIN_BOOSTERS so the flag never reaches the response or saved memory.
+_BOOSTER_DAILY = (True, True, False, False)
+
+# Cumulative protein and daily-only cost over the booster catalog (for the gap lookup)
+_BOOSTER_CUM_PROTEIN = np.cumsum([b["protein"] for b in PROTEIN_BOOSTERS])
+_BOOSTER_CUM_DAILY_COST = np.cumsum([b["price"] if daily else 0 for b, daily in zip(PROTEIN_BOOSTERS, _BOOSTER_DAILY)])
+
+# Daily protein target (g) per goal bucket
+_PROTEIN_TARGETS = {"gain": 150, "loss": 120, "maintenance": 100}
+
+# Budget tiers (₹/day) used for retrieval caching
+BUDGET_TIERS = (100, 200, 300, 500, 800, 1200, 2000)
+
+def _bucket_budget(budget) -> int:
+    """Snap a free-form budget up to the nearest tier (budgets above the top tier are kept as-is)."""
+    for tier in BUDGET_TIERS:
+        if budget <= tier:
+            return tier
+    return int(budget)
+
+# Response text templates (rendered per plan with str.format)
+_INTRO_TMPL = "Here is your optimized nutrition plan for {goal}."
+_WHY_IT_WORKS_TMPL = (
+    "This plan is designed for {goal}. {goal_rationale}"
+    "Carbs and Fats are balanced to ensure satiety and hormonal health."
+)
+_GOAL_RATIONALE_TMPL = {
+    "gain": "It prioritizes high protein ({total_protein}g) to support muscle hypertrophy while providing {total_cals} kcals for energy. ",
+    "loss": "It maintains a calorie deficit ({total_cals} kcals) for fat loss while keeping protein high ({total_protein}g) to preserve lean muscle. ",
+    "maintenance": "It provides a balanced macro split ({total_protein}g Protein) for sustained energy and overall wellness. "
+}
+
+# Plan memories are written to Pinecone in the background so the response never waits on it
+_MEMORY_POOL = ThreadPoolExecutor(max_workers=4)
+atexit.register(lambda: _MEMORY_POOL.shutdown(wait=True))
+
+def _save_plan_memory(content, result, user_id):
+    """Safe wrap around save_agent_memory (runs on _MEMORY_POOL)."""
+    try:
+        save_agent_memory("nutritionist", content, result, user_id)
+        chat_response_cache.clear_user(user_id)  # Cached nutritionist answers predate this plan
+    except Exception:
+        pass
+
 class NutritionistAgent:
     def __init__(self, data_loader, retriever):
         self.retriever = retriever
         self.data_loader = data_loader
 
+        # Retrieval depends only on (diet_type, budget bucket, goal), so memoize it per agent.
+        # lru_cache can't hash `self`, so the retriever is bound through this closure instead.
+        @lru_cache(maxsize=256)
+        def _retrieve_context(diet_type, budget_bucket, goal):
+            return tuple(retriever.retrieve({
+                "diet_type": diet_type,
+                "budget": budget_bucket,
+                "goal": goal
+            }))
+
+        self._retrieve_context = _retrieve_context
+
     def generate_plan(self, user_profile, wellness_data, fitness_coach_plan=None, user_id: str = "user_123"):
         
         # 1. Determine Targets
         goal = user_profile.get("goal", "General Health")
         budget = user_profile.get("budget", 500)
         
+        # Classify the goal once; every branch below keys off goal_bucket
         if 'Muscle' in goal or 'Gain' in goal:
-            protein_target = 150
+            goal_bucket = "gain"
         elif 'Loss' in goal or 'Cut' in goal:
-            protein_target = 120
+            goal_bucket = "loss"
         else:
-            protein_target = 100
+            goal_bucket = "maintenance"
         
-        # 2. Retrieve Data
-        criteria = {
-            "diet_type": user_profile.get("diet_type", "Vegetarian"),
-            "budget": budget,
-            "goal": goal
-        }
-        retrieved_items = self.retriever.retrieve(criteria)
+        protein_target = _PROTEIN_TARGETS[goal_bucket]
+        
+        # 2. Retrieve Data (budget snapped to a tier so similar requests share a cache entry)
+        budget_bucket = _bucket_budget(budget)
+        retrieved_items = list(self._retrieve_context(
+            user_profile.get("diet_type", "Vegetarian"),
+            budget_bucket,
+            goal
+        ))
         
         if not retrieved_items:
-            return json.dumps({"intro": "No suitable foods found.", "meals": {}, "totalDailyCost": 0})
+            return orjson.dumps({"intro": "No suitable foods found.", "meals": {}, "totalDailyCost": 0}).decode()
 
         # 3. Categorize by Meal Type
-        # We look for exact matches in the 'meal_type' column of the dataset
-        breakfast_pool = [m for m in retrieved_items if m.get('meal_type') == 'breakfast']
-        lunch_pool = [m for m in retrieved_items if m.get('meal_type') == 'lunch']
-        dinner_pool = [m for m in retrieved_items if m.get('meal_type') == 'dinner']
-        snack_pool = [m for m in retrieved_items if m.get('meal_type') == 'snack']
+        # We look for exact matches in the 'meal_type' column of the dataset (single pass)
+        buckets = {'breakfast': [], 'lunch': [], 'dinner': [], 'snack': []}
+        for m in retrieved_items:
+            bucket = buckets.get(m.get('meal_type'))
+            if bucket is not None:
+                bucket.append(m)
+        breakfast_pool = buckets['breakfast']
+        lunch_pool = buckets['lunch']
+        dinner_pool = buckets['dinner']
+        snack_pool = buckets['snack']
         
         # Fallback: If strict mapping fails, use the general pool but try to avoid duplicates
         general_pool = retrieved_items.copy()
@@ -62,32 +125,33 @@ class NutritionistAgent:
         # 4. Selection Logic (Enforce Variety)
         used_names = set()
 
+        # Retriever records always carry a 'name' column, so index it directly
         def select_meal(pool, fallback_pool, meal_name_debug):
             selected = None
             
             # Try specific pool first (Unique)
             for item in pool:
-                if item.get('name') not in used_names:
+                if item['name'] not in used_names:
                     selected = item
                     break
             
             # Try fallback pool (Unique)
             if not selected:
                 for item in fallback_pool:
-                    if item.get('name') not in used_names:
+                    if item['name'] not in used_names:
                         selected = item
                         break
             
-            # Last Resort: Pick anything from specific pool (Duplicate allowed)
+            # Last Resort: Best-ranked item from specific pool (Duplicate allowed)
             if not selected and pool:
-                selected = random.choice(pool)
+                selected = pool[0]
             
-            # Absolute Last Resort: Pick anything
+            # Absolute Last Resort: Best-ranked item overall
             if not selected and fallback_pool:
-                selected = random.choice(fallback_pool)
+                selected = fallback_pool[0]
                 
             if selected:
-                used_names.add(selected.get('name'))
+                used_names.add(selected['name'])
                 
             return selected
 
@@ -96,40 +160,37 @@ class NutritionistAgent:
         
         # Smart Snack Selection: If no snack found, find low calorie item from general
         if not snack_pool:
-            snack_pool = [m for m in general_pool if m.get('calories', 0) < 300]
+            snack_pool = [m for m in general_pool if m['calories'] < 300]
         snacks = select_meal(snack_pool, general_pool, "Snacks")
         
         dinner = select_meal(dinner_pool, general_pool, "Dinner")
 
         # 5. Build Response Helper
+        # Every record carries the loader's hot columns, so fields are indexed directly;
+        # recipe/ingredients/link live in the loader's detail frame and are joined only here
         def format_meal(meal_data, type_label):
             if not meal_data: return None
             
-            # Handle JSON strings in dataset
-            def parse_json(field):
-                if isinstance(meal_data.get(field), str):
-                    try: return json.loads(meal_data[field])
-                    except: return []
-                return meal_data.get(field, [])
-
+            details = self.data_loader.get_details(meal_data['name'])
+            price = meal_data['price_inr']
             return {
-                "mealName": meal_data.get('name', 'Meal'),
+                "mealName": meal_data['name'],
                 "mainDish": {
-                    "name": meal_data.get('name'),
-                    "price": meal_data.get('price_inr', 0),
+                    "name": meal_data['name'],
+                    "price": price,
                     "description": f"Best {type_label} option for {goal}",
                     "type": "main"
                 },
-                "totalCost": meal_data.get('price_inr', 0),
+                "totalCost": price,
                 "nutrients": {
-                    "protein": meal_data.get('protein', 0),
-                    "carbs": meal_data.get('carbs', 0),
-                    "fat": meal_data.get('fats', 0),
-                    "calories": meal_data.get('calories', 0)
+                    "protein": meal_data['protein'],
+                    "carbs": meal_data['carbs'],
+                    "fat": meal_data['fats'],
+                    "calories": meal_data['calories']
                 },
-                "recipe": parse_json('recipe'),
-                "ingredients": parse_json('ingredients'),
-                "youtubeLink": meal_data.get('youtube_link', '')
+                "recipe": details['recipe'],
+                "ingredients": details['ingredients'],
+                "youtubeLink": details['youtube_link']
             }
 
         final_plan = {
@@ -141,47 +202,42 @@ class NutritionistAgent:
 
         # 6. Calculate Totals & Boosters
         valid_meals = [m for m in final_plan.values() if m]
-        total_protein = sum(m['nutrients']['protein'] for m in valid_meals)
+        # One (meals x [protein, carbs, fat, calories, cost]) array summed in a single pass
         # Base daily cost is just the fresh meals
-        total_cost = sum(m['totalCost'] for m in valid_meals)
-        total_cals = sum(m['nutrients']['calories'] for m in valid_meals)
+        totals = np.array([
+            [m['nutrients']['protein'], m['nutrients']['carbs'], m['nutrients']['fat'], m['nutrients']['calories'], m['totalCost']]
+            for m in valid_meals
+        ]).reshape(-1, 5).sum(axis=0).tolist()
+        total_protein, total_carbs, total_fat, total_cals, total_cost = totals
 
         protein_gap = protein_target - total_protein
         boosters_needed = []
         
         if protein_gap > 5: # Only suggest if gap is significant
-            for booster in PROTEIN_BOOSTERS:
-                if protein_gap <= 0: break
-                
-                # Add booster
-                boosters_needed.append(booster)
-                protein_gap -= booster['protein']
-                
-                # Update Cost Logic:
-                # ONLY add cost for fresh daily items (Eggs, Yogurt).
-                # Exclude bulk items (Peanut Butter, Protein Bars) from DAILY cost tally.
-                if "Eggs" in booster['name'] or "Yogurt" in booster['name']:
-                    total_cost += booster['price']
-                # Peanut Butter/Bars are one-time purchases, so we don't add to daily sum
+            # Take boosters in catalog order until the gap is closed: the first k whose
+            # cumulative protein reaches the gap (all of them if none does)
+            k = min(int(np.searchsorted(_BOOSTER_CUM_PROTEIN, protein_gap)) + 1, len(PROTEIN_BOOSTERS))
+            boosters_needed = PROTEIN_BOOSTERS[:k]
+            
+            # Update Cost Logic:
+            # ONLY add cost for fresh daily items (Eggs, Yogurt).
+            # Peanut Butter/Bars are one-time purchases, so we don't add to daily sum
+            total_cost += int(_BOOSTER_CUM_DAILY_COST[k - 1])
 
         # Detailed Explanation Generation
-        explanation = f"This plan is designed for {goal}. "
-        if 'Muscle' in goal or 'Gain' in goal:
-            explanation += f"It prioritizes high protein ({total_protein}g) to support muscle hypertrophy while providing {total_cals} kcals for energy. "
-        elif 'Loss' in goal or 'Cut' in goal:
-            explanation += f"It maintains a calorie deficit ({total_cals} kcals) for fat loss while keeping protein high ({total_protein}g) to preserve lean muscle. "
-        else:
-            explanation += f"It provides a balanced macro split ({total_protein}g Protein) for sustained energy and overall wellness. "
-            
-        explanation += "Carbs and Fats are balanced to ensure satiety and hormonal health."
+        rationale_tmpl = _GOAL_RATIONALE_TMPL[goal_bucket]
+        explanation = _WHY_IT_WORKS_TMPL.format(
+            goal=goal,
+            goal_rationale=rationale_tmpl.format(total_protein=total_protein, total_cals=total_cals)
+        )
 
         result = {
-            "intro": f"Here is your optimized nutrition plan for {goal}.",
+            "intro": _INTRO_TMPL.format(goal=goal),
             "meals": final_plan,
             "totalMacros": {
                 "protein": total_protein,
-                "carbs": sum(m['nutrients']['carbs'] for m in valid_meals),
-                "fat": sum(m['nutrients']['fat'] for m in valid_meals),
+                "carbs": total_carbs,
+                "fat": total_fat,
                 "calories": total_cals
             },
             "proteinTarget": protein_target,
@@ -190,9 +246,9 @@ class NutritionistAgent:
             "whyItWorks": explanation
         }
 
-        # Memory Save (Safe Wrap)
-        try:
-             save_agent_memory("nutritionist", f"Plan: {total_cals}kcal", result, user_id)
-        except: pass
+        response = orjson.dumps(result).decode()
+        
+        # Memory Save (background, off the response path)
+        _MEMORY_POOL.submit(_save_plan_memory, f"Plan: {total_cals}kcal", result, user_id)
         
-        return json.dumps(result)
\ No newline at end of file
+        return response
\ No newline at end of file
@@ -1,18 +1,80 @@
+import numpy as np
 import pandas as pd
 import json
 import os
 
+# Bump when the flattened frame's layout changes so stale caches are rebuilt
+CACHE_VERSION = 4
+
+def build_indexes(df):
+    """Precompute the lookups every retrieval needs (veg mask and goal sort orders)."""
+    if df.empty:
+        return {}
+    return {
+        'veg_mask': df['type'].values == 'Veg',
+        'protein_order': np.argsort(-df['protein'].values, kind='stable'),
+        'calorie_order': np.argsort(df['calories'].values, kind='stable'),
+    }
+
+# Columns read by retrieval and scoring; everything else is only needed for the chosen meals
+HOT_COLUMNS = ['name', 'meal_type', 'type', 'price_inr', 'calories', 'protein', 'carbs', 'fats']
+
+def split_hot_cold(df):
+    """Split the flattened frame into the hot retrieval columns and a name-indexed detail frame."""
+    if df.empty:
+        return df, pd.DataFrame()
+    cold_columns = ['name'] + [c for c in df.columns if c not in HOT_COLUMNS]
+    return df[HOT_COLUMNS].copy(), df[cold_columns].set_index('name')
+
 class FoodDataLoader:
     def __init__(self, csv_path, json_path):
         self.csv_path = csv_path
         self.json_path = json_path
-        self.data = self._load_and_merge()
+        # data: compact frame scanned per request; details: recipe/ingredients/etc. looked up by name
+        self.data, self.details = split_hot_cold(self._load_and_merge())
+        self.indexes = build_indexes(self.data)
+
+    def _source_signature(self):
+        """
+        Cache layout version, pandas/numpy versions and source mtimes; the cached frame is
+        reused only while these match (a pickle from another pandas/numpy may not load).
+        """
+        csv_mtime = os.path.getmtime(self.csv_path) if self.csv_path and os.path.exists(self.csv_path) else 0
+        return [CACHE_VERSION, pd.__version__, np.__version__, os.path.getmtime(self.json_path), csv_mtime]
+
+    def _read_cache(self, cache_path, meta_path, sig):
+        # Any failure (missing file, bad JSON, or a pickle written by another pandas/numpy,
+        # which can raise AttributeError/ModuleNotFoundError/TypeError) is a cache miss
+        try:
+            with open(meta_path, 'r') as f:
+                if json.load(f) != sig:
+                    return None
+            return pd.read_pickle(cache_path)
+        except Exception:
+            return None
+
+    def _write_cache(self, df, cache_path, meta_path, sig):
+        try:
+            df.to_pickle(cache_path)
+            with open(meta_path, 'w') as f:
+                json.dump(sig, f)
+        except OSError as e:
+            print(f"⚠️ Could not write meal cache: {e}")
 
     def _load_and_merge(self):
         try:
             # 1. Load JSON (Meal data with nutrition, ingredients, pricing)
             if not os.path.exists(self.json_path):
                 raise FileNotFoundError(f"JSON not found at {self.json_path}")
+            
+            # Reuse the flattened frame from a previous start if the sources haven't changed
+            cache_path = self.json_path + '.pkl'
+            meta_path = self.json_path + '.meta'
+            sig = self._source_signature()
+            df = self._read_cache(cache_path, meta_path, sig)
+            if df is not None:
+                print(f"✅ Data Loaded from cache. {len(df)} meals available.")
+                return df
                 
             with open(self.json_path, 'r') as f:
                 json_data = json.load(f)
@@ -47,13 +109,13 @@ class FoodDataLoader:
                 flat_meal['fats'] = nutrition.get('fat', 0)
                 flat_meal['fiber'] = nutrition.get('fiber', 0)
                 
-                # Store recipe as JSON array string (preserve steps)
+                # Store recipe steps as a list (passed straight through to the response)
                 recipe_steps = meal.get('recipe', [])
-                flat_meal['recipe'] = json.dumps(recipe_steps)  # Store as JSON string
+                flat_meal['recipe'] = recipe_steps
                 
-                # Store ingredients with blinkit links as JSON string
+                # Store ingredients with blinkit links as a list of dicts
                 ingredients = meal.get('ingredients', [])
-                flat_meal['ingredients'] = json.dumps(ingredients)  # Full ingredient data with blinkit
+                flat_meal['ingredients'] = ingredients  # Full ingredient data with blinkit
                 flat_meal['ingredients_str'] = ', '.join([ing.get('name', '') for ing in ingredients])
                 
                 flat_data.append(flat_meal)
@@ -64,6 +126,16 @@ class FoodDataLoader:
             # "veg" -> "Veg", "non-veg" -> "Non-Veg"
             df['type'] = df['type'].apply(lambda x: 'Non-Veg' if 'non' in x.lower() else 'Veg')
             
+            # The dataset has many duplicates (same meal under several ids). Keep the first
+            # of each name once here so retrieval never has to deduplicate per request.
+            df = df.drop_duplicates(subset=['name']).reset_index(drop=True)
+            
+            # Low-cardinality label columns compare as integer codes when categorical
+            df['type'] = df['type'].astype('category')
+            df['meal_type'] = df['meal_type'].astype('category')
+            
+            self._write_cache(df, cache_path, meta_path, sig)
+            
             print(f"✅ Data Loaded Successfully. {len(df)} meals available.")
             print(f"   Diet types: {df['type'].unique()}")
             print(f"   Price range: ₹{df['price_inr'].min()} - ₹{df['price_inr'].max()}")
@@ -78,3 +150,7 @@ class FoodDataLoader:
 
     def get_data(self):
         return self.data
+
+    def get_details(self, name):
+        """Cold columns (recipe, ingredients, youtube_link, ...) for one meal."""
+        return self.details.loc[name]
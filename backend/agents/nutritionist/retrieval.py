@@ -1,8 +1,48 @@
+import numpy as np
 import pandas as pd
+from functools import lru_cache
+from .data_loader import build_indexes
+
+def _topk_indices(order, mask, k):
+    """Row indices of the first k rows of a precomputed sort order that pass the filter mask."""
+    return order[mask[order]][:k]
 
 class DietRetriever:
-    def __init__(self, data_frame):
+    def __init__(self, data_frame, indexes=None):
         self.df = data_frame
+        # Loader-built indexes are reused when given; otherwise build them once here
+        self.indexes = indexes if indexes is not None else build_indexes(data_frame)
+        # Contiguous numeric column used by the budget filter (read once, not per request)
+        self.prices = np.ascontiguousarray(data_frame['price_inr'].values) if not data_frame.empty else None
+        # Row selection depends only on (veg, budget, sort order) and the frame never changes,
+        # so memoize it per retriever. Records are still materialized fresh on every call.
+        self._select_cached = lru_cache(maxsize=256)(self._select)
+
+    def _select(self, is_veg_user, budget, order_key):
+        """Top-50 row indices for one normalized criteria tuple."""
+        prices = self.prices
+
+        # 2. Diet Filter (precomputed; shared by the first pass and the retry)
+        # Non-veg users see everything (Veg + Non-Veg), so they get no diet mask at all
+        diet_mask = self.indexes['veg_mask'] if is_veg_user else None
+
+        # 3. Budget Filter
+        per_meal_budget = budget / 2  # Allow buffer
+
+        mask = prices <= per_meal_budget
+        if diet_mask is not None:
+            mask &= diet_mask
+
+        # Retry with full budget if too strict
+        if not mask.any():
+            mask = prices <= budget
+            if diet_mask is not None:
+                mask &= diet_mask
+
+        # 4. Sorting based on Goal (walk the precomputed order, keeping rows that pass the mask)
+        top_idx = _topk_indices(self.indexes[order_key], mask, 50)
+        top_idx.flags.writeable = False  # shared between cache hits
+        return top_idx
 
     def retrieve(self, criteria):
         """
@@ -15,45 +55,22 @@ class DietRetriever:
             print("⚠️ DataFrame is empty, no data to filter")
             return []
 
-        # 1. Start with full data
-        filtered = self.df.copy()
-        
-        # 2. Diet Filter
-        user_diet = criteria.get('diet_type', 'Vegetarian')
-        if user_diet.lower() in ['vegetarian', 'veg']:
-            filtered = filtered[filtered['type'] == 'Veg']
-        # Non-veg users see everything (Veg + Non-Veg)
-
-        # 3. Budget Filter
+        # 1. Normalize criteria into a hashable key (diet flag, budget, goal sort order)
+        is_veg_user = criteria.get('diet_type', 'Vegetarian').lower() in ['vegetarian', 'veg']
         budget = criteria.get('budget', 500)
-        per_meal_budget = budget / 2  # Allow buffer
-        
-        filtered = filtered[filtered['price_inr'] <= per_meal_budget]
-        
-        # Retry with full budget if too strict
-        if len(filtered) == 0:
-            filtered = self.df.copy()
-            if user_diet.lower() in ['vegetarian', 'veg']:
-                filtered = filtered[filtered['type'] == 'Veg']
-            filtered = filtered[filtered['price_inr'] <= budget]
-
-        # 4. Sorting based on Goal
         goal = criteria.get('goal', 'General Health')
-        
-        if 'Muscle' in goal or 'Gain' in goal:
-            filtered = filtered.sort_values(by='protein', ascending=False)
-        elif 'Loss' in goal or 'Cut' in goal:
-            filtered = filtered.sort_values(by='calories', ascending=True)
+
+        if 'Loss' in goal or 'Cut' in goal:
+            order_key = 'calorie_order'
         else:
-            filtered = filtered.sort_values(by='protein', ascending=False)
+            # Muscle / Gain and general goals both rank by protein
+            order_key = 'protein_order'
 
-        # --- CRITICAL FIX: DEDUPLICATION ---
-        # The dataset has many duplicates. We must remove them based on name
-        # before taking the top N, otherwise we get 20 copies of the same meal.
-        filtered = filtered.drop_duplicates(subset=['name'])
+        top_idx = self._select_cached(is_veg_user, budget, order_key)
 
         # 5. Return top 50 candidates (Increased from 20 to ensure variety across meal types)
-        result = filtered.head(50).to_dict(orient='records')
-        
+        # Names are already unique (FoodDataLoader deduplicates at load time)
+        result = self.df.iloc[top_idx].to_dict(orient='records')
+
         print(f"✅ Retriever found {len(result)} unique meals after filtering.")
-        return result
\ No newline at end of file
+        return result
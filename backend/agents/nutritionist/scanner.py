@@ -1,10 +1,7 @@
-import google.generativeai as genai
 import os
-import json
+import orjson
 import typing_extensions as typing
-
-# Configure Gemini
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+from functools import lru_cache
 
 # Define the exact schema from your TypeScript code for strict JSON output
 class Ingredient(typing.TypedDict):
@@ -36,15 +33,17 @@ class ScanResult(typing.TypedDict):
     warnings: list[str]
     alternatives: list[Alternative]
 
-def analyze_food_image(image_bytes, user_profile):
+@lru_cache(maxsize=1)
+def _get_model():
     """
-    Analyzes an image using Gemini Flash 1.5 to extract nutrition info
-    based on the user's specific diet profile.
+    Import/configure Gemini and build the scanner model on the first scan; the model
+    (and its ScanResult schema) is then reused for every scan.
     """
-    # Prefer env key if set in configure, but explicit key passing is also fine if logic changes
-    # Here we rely on genai.configure being called with a valid key.
-    # Initialize Gemini
-    model = genai.GenerativeModel(
+    import google.generativeai as genai
+
+    # Configure Gemini
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(
         "gemini-2.5-flash",
         generation_config={
             "response_mime_type": "application/json", 
@@ -52,6 +51,11 @@ def analyze_food_image(image_bytes, user_profile):
         }
     )
 
+def analyze_food_image(image_bytes, user_profile):
+    """
+    Analyzes an image using Gemini Flash 1.5 to extract nutrition info
+    based on the user's specific diet profile.
+    """
     prompt = f"""
     You are an expert AI Nutritionist using computer vision.
     Analyze this food product image packaging or meal.
@@ -82,7 +86,7 @@ def analyze_food_image(image_bytes, user_profile):
     """
 
     try:
-        response = model.generate_content([
+        response = _get_model().generate_content([
             {'mime_type': 'image/jpeg', 'data': image_bytes},
             prompt
         ])
@@ -91,7 +95,7 @@ def analyze_food_image(image_bytes, user_profile):
         # Clean response text if it contains markdown code blocks
         text = response.text.replace("```json", "").replace("```", "").strip()
         
-        data = json.loads(text)
+        data = orjson.loads(text)
         
         # Validate data structure (basic check)
         if "nutrition" not in data:
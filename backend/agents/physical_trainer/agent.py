@@ -1,32 +1,47 @@
 import os
-from crewai import Agent, LLM
+from functools import lru_cache
 
-# Import your tools
-from backend.tools.squats_tool import SquatAnalysisTool
-from backend.tools.pushups_tool import PushupAnalysisTool
-from backend.tools.context_tool import FitnessHistoryTool, UserCalendarTool
-from backend.tools.save_tool import SaveWorkoutTool
 
-# 1. SETUP GEMINI (Using the 'gemini/' prefix for CrewAI)
-my_llm = LLM(
-    model="gemini/gemini-2.5-flash",
-    google_api_key=os.environ["GEMINI_API_KEY"],
-    temperature=0.5
-)
-    
+@lru_cache(maxsize=1)
+def _get_llm_and_tools():
+    """
+    Import crewai and the vision/context tools on first use instead of at module import,
+    so workers that never run the trainer don't pay for them. Built once and shared.
+    """
+    from crewai import LLM
 
-# Instantiate Tools
-squat_tool = SquatAnalysisTool()
-pushup_tool = PushupAnalysisTool()
-rag_tool = FitnessHistoryTool()
-calendar_tool = UserCalendarTool()
-save_tool = SaveWorkoutTool()
+    # Import your tools
+    from backend.tools.squats_tool import SquatAnalysisTool
+    from backend.tools.pushups_tool import PushupAnalysisTool
+    from backend.tools.context_tool import FitnessHistoryTool, UserCalendarTool
+    from backend.tools.save_tool import SaveWorkoutTool
+
+    # 1. SETUP GEMINI (Using the 'gemini/' prefix for CrewAI)
+    my_llm = LLM(
+        model="gemini/gemini-2.5-flash",
+        google_api_key=os.environ["GEMINI_API_KEY"],
+        temperature=0.5
+    )
+
+    # Instantiate Tools
+    tools = {
+        "squat": SquatAnalysisTool(),
+        "pushup": PushupAnalysisTool(),
+        "rag": FitnessHistoryTool(),
+        "calendar": UserCalendarTool(),
+        "save": SaveWorkoutTool(),
+    }
+    return my_llm, tools
 
 class PhysicalTrainerAgent:
-    def create(self, user_id: str = "user_123"):
+    def create(self, user_id: str = "user_123", verbose: bool = True):
+        from crewai import Agent
+
+        my_llm, tools = _get_llm_and_tools()
+        
         # Configure tools with user_id
-        save_tool.user_id = user_id
-        rag_tool.user_id = user_id
+        tools["save"].user_id = user_id
+        tools["rag"].user_id = user_id
         
         return Agent(
             role='Senior Personal Trainer & Biomechanics Strategist',
@@ -46,8 +61,8 @@ class PhysicalTrainerAgent:
                 "- If RAG shows 'Fasted' or 'Stressed' AND Vision shows 'Bad Form': Prescribe a REGRESSED workout.\n"
                 "- If RAG shows 'Normal' AND Vision shows 'Good Form': Prescribe progressive overload."
             ),
-            tools=[squat_tool, pushup_tool, rag_tool, calendar_tool, save_tool],
+            tools=[tools["squat"], tools["pushup"], tools["rag"], tools["calendar"], tools["save"]],
             llm=my_llm, 
-            verbose=True,
+            verbose=verbose,
             memory=False  # Disabled - using Pinecone for memory instead to avoid stale cache
         )
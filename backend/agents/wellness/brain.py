@@ -9,58 +9,68 @@ Adapted from: fitness_agent/brain.py
 """
 
 import os
-import json
+import re
+import orjson
+import hashlib
+import tempfile
+from types import MappingProxyType
 import google.generativeai as genai
+import httpx
+from groq import Groq
+from diskcache import Cache
 from dotenv import load_dotenv
 
-load_dotenv(dotenv_path='../.env.local')
-load_dotenv()
+# h2 enables HTTP/2 on the shared httpx client; plain HTTP/1.1 keep-alive is the fallback
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+# Parse the .env files only once; importlib.reload re-runs this module in the same
+# namespace, so the flag survives hot reloads (e.g. Streamlit's)
+if not globals().get("_ENV_LOADED"):
+    load_dotenv(dotenv_path='../.env.local')
+    load_dotenv()
+    _ENV_LOADED = True
 
 # Add backend directory to path so we can import tools
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../..")))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
+from backend.tools.memory_store import get_wellness_memory, format_wellness_context
+from backend.tools.chat_cache import chat_response_cache, message_vector
 
 # Get API key from environment (support both GOOGLE_API_KEY and GEMINI_API_KEY)
 api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-if api_key:
+if api_key and api_key != globals().get("_LAST_KEY"):
     genai.configure(api_key=api_key)
+    _LAST_KEY = api_key
 
+# Cache of Gemini analyses keyed on coarsely rounded biometrics (on disk, shared across workers)
+_analysis_cache = Cache(
+    os.environ.get("WELLNESS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "triad_wellness")),
+    size_limit=int(1e8)
+)
 
-def analyze_wellness(data: dict) -> dict:
-    """
-    Analyze biometric data and generate personalized wellness recommendations.
-    
-    Args:
-        data: Dictionary containing:
-            - sleep_hours (float): Hours of sleep
-            - hrv (int): Heart Rate Variability in ms
-            - rhr (int): Resting Heart Rate in bpm
-            
-    Returns:
-        Dictionary with wellness analysis including readiness score,
-        interventions, and recommendations.
-    """
-    # Use the stable model
-    model = genai.GenerativeModel('gemini-2.0-flash-exp')
-    
-    # Extract data with defaults
-    sleep_hours = data.get('sleep_hours', 7)
-    hrv = data.get('hrv', 50)
-    rhr = data.get('rhr', 65)
-    
-    # --- PROMPT ENGINEERING: CHAIN OF THOUGHT & PERSONA ---
-    prompt = f"""
+# Seconds a cached analysis stays valid
+WELLNESS_CACHE_TTL = int(os.environ.get("WELLNESS_CACHE_TTL", 86400))
+
+
+def _get_analysis_key(sleep_hours, hrv, rhr) -> str:
+    """Fingerprint biometrics on a coarse grid (0.1h sleep, 2ms HRV, 2bpm RHR) so near-identical days share an analysis."""
+    grid = f"{round(float(sleep_hours), 1)}|{int(hrv) // 2}|{int(rhr) // 2}"
+    return hashlib.sha256(grid.encode()).hexdigest()
+
+
+# --- PROMPT ENGINEERING: CHAIN OF THOUGHT & PERSONA ---
+# Static role/instructions/output format go in the model's system instruction so every call
+# shares the same prefix; only the DATA INPUT block below is sent per call.
+_SYSTEM_INSTRUCTION = """
     ROLE:
     You are an Elite Human Performance Architect (Psychology + Physiology). 
     Your client is a high-performer (athlete/founder). Your job is to optimize their day based on biometrics.
 
-    DATA INPUT:
-    - Sleep Duration: {sleep_hours} hours
-    - HRV (Heart Rate Variability): {hrv} ms (Higher is better, indicative of recovery)
-    - Resting Heart Rate (RHR): {rhr} bpm (Lower is better)
-
     ANALYSIS INSTRUCTIONS:
     1. **Correlate the metrics**: 
        - Low Sleep + Low HRV = Acute Fatigue (Needs rest).
@@ -69,66 +79,188 @@ def analyze_wellness(data: dict) -> dict:
     2. **Prioritize Mental State**: If HRV is low, the nervous system is stressed. Prescribe mental regulation tools (breathwork, nature exposure) over physical intensity.
 
     OUTPUT FORMAT (Strict JSON, no markdown):
-    {{
+    {
       "executive_summary": "One punchy sentence describing their current biological state (e.g., 'Sympathetic Overdrive detected' or 'Prime Physiological Readiness').",
       "readiness_score": (integer 0-100),
       "micro_intervention": "A specific, immediate 2-minute bio-hack to shift state (e.g., 'View morning sunlight', 'Box breathing', 'Cold water face splash').",
       "training_protocol": "Precise workout instruction using terms like 'Zone 2 Cardio', 'CNS Priming', or 'Active Recovery'.",
       "cognitive_framing": "A psychological anchor, stoic quote, or mental model to handle the day's stress.",
       "nutritional_strategy": "Specific dietary focus (e.g., 'High antioxidants', 'Complex carbs for cortisol management', 'Fasted morning')."
-    }}
+    }
+    """
+
+# Per-call prompt, rendered with format_map
+_PROMPT_TMPL = """
+    DATA INPUT:
+    - Sleep Duration: {sleep_hours} hours
+    - HRV (Heart Rate Variability): {hrv} ms (Higher is better, indicative of recovery)
+    - Resting Heart Rate (RHR): {rhr} bpm (Lower is better)
+    """
+
+# Outermost JSON object in a free-text LLM reply
+_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Use the stable model (built once, reused across analyses)
+_MODEL = genai.GenerativeModel('gemini-2.0-flash-exp', system_instruction=_SYSTEM_INSTRUCTION) if api_key else None
+
+# Pooled HTTP transport for Groq: keep-alive connections are reused across chats, and
+# HTTP/2 multiplexes concurrent requests over one socket when h2 is installed.
+# (Gemini goes through gRPC, which already multiplexes over a single channel.)
+_HTTP = httpx.Client(
+    http2=h2 is not None,
+    limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60)
+)
+
+# Groq client for coach chat (one client, so its connection pool is reused across chats)
+_GROQ = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=_HTTP) if os.getenv("GROQ_API_KEY") else None
+
+
+# Defaults for missing biometrics, merged in one step
+_WELLNESS_DEFAULTS = {'sleep_hours': 7, 'hrv': 50, 'rhr': 65}
+
+
+def _read_biometrics(data: dict) -> dict:
+    """Merge the caller's biometrics over the defaults."""
+    return {**_WELLNESS_DEFAULTS, **(data or {})}
+
+
+# Canned analyses for the unambiguous corners of the correlation rules in the prompt
+_PRIME_STATE_ANALYSIS = {
+    "executive_summary": "Prime Physiological Readiness - fully recovered and primed to push.",
+    "readiness_score": 92,
+    "micro_intervention": "View morning sunlight for 2 minutes to lock in your circadian rhythm.",
+    "training_protocol": "CNS Priming followed by high-intensity work - push limits today.",
+    "cognitive_framing": "Fortune favors the prepared; today you are prepared.",
+    "nutritional_strategy": "Complex carbs around training to fuel high output."
+}
+
+_ACUTE_FATIGUE_ANALYSIS = {
+    "executive_summary": "Acute Fatigue detected - the nervous system needs rest.",
+    "readiness_score": 35,
+    "micro_intervention": "Box breathing (4-4-4-4) for 2 minutes to downshift the nervous system.",
+    "training_protocol": "Active Recovery only: light walk or mobility, no intensity.",
+    "cognitive_framing": "Rest is part of the work; recovery is where adaptation happens.",
+    "nutritional_strategy": "High antioxidants and complex carbs for cortisol management."
+}
+
+
+def _fast_classify(sleep_hours, hrv, rhr):
     """
+    Deterministic analysis for clearly classifiable biometrics, or None when the
+    inputs are ambiguous and need Gemini.
     
+    - High Sleep + High HRV (+ low RHR) = Prime State
+    - Low Sleep + Low HRV = Acute Fatigue
+    """
     try:
-        response = model.generate_content(prompt)
-        clean_text = response.text.replace("```json", "").replace("```", "").strip()
-        return json.loads(clean_text)
-    except Exception as e:
-        print(f"Error generating wellness content: {e}")
-        # Robust Fallback for Demo Safety
-        return {
-            "executive_summary": "Data processing error, assuming baseline recovery.",
-            "readiness_score": 70,
-            "micro_intervention": "Take 5 deep breaths.",
-            "training_protocol": "Maintenance volume training.",
-            "cognitive_framing": "Focus on what you can control.",
-            "nutritional_strategy": "Eat whole foods."
-        }
+        sleep_hours, hrv, rhr = float(sleep_hours), float(hrv), float(rhr)
+    except (TypeError, ValueError):
+        return None
+    
+    if sleep_hours >= 8 and hrv >= 60 and rhr <= 55:
+        return dict(_PRIME_STATE_ANALYSIS)
+    if sleep_hours < 5 and hrv < 30:
+        return dict(_ACUTE_FATIGUE_ANALYSIS)
+    return None
 
 
-def generate_wellness_chat_response(user_message: str, wellness_data: dict = None, user_profile: dict = None, user_id: str = "user_123") -> dict:
+def _build_wellness_request(biometrics: dict):
+    """Build the analysis prompt and its cache key from merged biometrics."""
+    prompt = _PROMPT_TMPL.format_map(biometrics)
+    return prompt, _get_analysis_key(biometrics['sleep_hours'], biometrics['hrv'], biometrics['rhr'])
+
+
+def _parse_and_cache_analysis(cache_key: str, text: str) -> dict:
+    """Parse Gemini's reply and cache it (only successful analyses are stored)."""
+    clean_text = text.replace("```json", "").replace("```", "").strip()
+    analysis = orjson.loads(clean_text)
+    _analysis_cache.set(cache_key, clean_text, expire=WELLNESS_CACHE_TTL)
+    return analysis
+
+
+# Robust Fallback for Demo Safety (read-only; callers get a fresh copy)
+_FALLBACK_WELLNESS = MappingProxyType({
+    "executive_summary": "Data processing error, assuming baseline recovery.",
+    "readiness_score": 70,
+    "micro_intervention": "Take 5 deep breaths.",
+    "training_protocol": "Maintenance volume training.",
+    "cognitive_framing": "Focus on what you can control.",
+    "nutritional_strategy": "Eat whole foods."
+})
+
+
+def _fallback_analysis(e: Exception) -> dict:
+    print(f"Error generating wellness content: {e}")
+    return dict(_FALLBACK_WELLNESS)
+
+
+def analyze_wellness(data: dict) -> dict:
     """
-    Generate a wellness coach chat response using AI.
+    Analyze biometric data and generate personalized wellness recommendations.
     
     Args:
-        user_message: The user's message/question
-        wellness_data: Optional biometric data for context
-        user_profile: Optional user profile (calories, phase, etc.)
-        
+        data: Dictionary containing:
+            - sleep_hours (float): Hours of sleep
+            - hrv (int): Heart Rate Variability in ms
+            - rhr (int): Resting Heart Rate in bpm
+            
     Returns:
-        Dict with agentType, content, and summary
+        Dictionary with wellness analysis including readiness score,
+        interventions, and recommendations.
     """
     try:
-        from groq import Groq
-        from backend.tools.memory_store import get_wellness_memory, format_wellness_context
+        biometrics = _read_biometrics(data)
         
-        # Fetch wellness context from Pinecone
-        wellness_memories = get_wellness_memory(query=user_message, top_k=3, user_id=user_id)
-        context = format_wellness_context(wellness_memories) if wellness_memories else "No recent wellness data available."
+        # Clear-cut zones skip the LLM entirely
+        quick = _fast_classify(biometrics['sleep_hours'], biometrics['hrv'], biometrics['rhr'])
+        if quick is not None:
+            return quick
         
-        # Build biometric context if available
-        biometric_context = ""
-        if wellness_data:
-            biometric_context = f"\n**Current Biometrics:**\n- Sleep: {wellness_data.get('sleep_hours', 'N/A')} hours\n- HRV: {wellness_data.get('hrv', 'N/A')} ms\n- RHR: {wellness_data.get('rhr', 'N/A')} bpm\n"
+        prompt, cache_key = _build_wellness_request(biometrics)
+        cached_analysis = _analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            return orjson.loads(cached_analysis)
+        
+        response = _MODEL.generate_content(prompt)
+        return _parse_and_cache_analysis(cache_key, response.text)
+    except Exception as e:
+        return _fallback_analysis(e)
+
+
+async def analyze_wellness_async(data: dict) -> dict:
+    """
+    Non-blocking variant of analyze_wellness (same cache and fallback), so several
+    analyses can be awaited concurrently with asyncio.gather.
+    """
+    try:
+        biometrics = _read_biometrics(data)
         
-        # Build user profile context
-        profile_context = ""
-        if user_profile:
-            profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')}\n"
+        # Clear-cut zones skip the LLM entirely
+        quick = _fast_classify(biometrics['sleep_hours'], biometrics['hrv'], biometrics['rhr'])
+        if quick is not None:
+            return quick
         
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        prompt, cache_key = _build_wellness_request(biometrics)
+        cached_analysis = _analysis_cache.get(cache_key)
+        if cached_analysis is not None:
+            return orjson.loads(cached_analysis)
         
-        system_prompt = """You are an expert Wellness Coach AI assistant specializing in recovery, stress management, and biometric optimization.
+        response = await _MODEL.generate_content_async(prompt)
+        return _parse_and_cache_analysis(cache_key, response.text)
+    except Exception as e:
+        return _fallback_analysis(e)
+
+
+_CHAT_MODEL = "llama-3.1-8b-instant"
+
+# Chat reply when the coach can't be reached (read-only; callers get a fresh copy)
+_FALLBACK_CHAT = MappingProxyType({
+    "agentType": "Wellness Coach",
+    "content": "Unable to analyze wellness data at this time.",
+    "summary": "Please check wellness connection."
+})
+
+_CHAT_SYSTEM_PROMPT = """You are an expert Wellness Coach AI assistant specializing in recovery, stress management, and biometric optimization.
 
 Based on the user's message, biometric history, and wellness data, provide:
 1. A brief analysis of their current wellness/recovery status
@@ -137,56 +269,150 @@ Based on the user's message, biometric history, and wellness data, provide:
 Keep responses concise (2-3 sentences for summary, 1-2 for recommendation).
 Format your response as JSON with keys: "summary" (string), "recommendation" (string)"""
 
-        user_prompt = f"""User says: "{user_message}"
+# Optional context blocks for the chat prompt (missing fields shown as placeholders)
+_BIOMETRIC_CONTEXT_TMPL = "\n**Current Biometrics:**\n- Sleep: {sleep_hours} hours\n- HRV: {hrv} ms\n- RHR: {rhr} bpm\n"
+_BIOMETRIC_CONTEXT_DEFAULTS = {'sleep_hours': 'N/A', 'hrv': 'N/A', 'rhr': 'N/A'}
+
+_PROFILE_CONTEXT_TMPL = "\n**User Profile:**\n- Daily Calories: {calories} kcal\n- Phase: {phase}\n"
+_PROFILE_CONTEXT_DEFAULTS = {'calories': 'Not set', 'phase': 'Not set'}
+
+
+def _build_wellness_chat_messages(user_message: str, wellness_data: dict = None, user_profile: dict = None, user_id: str = "user_123") -> list:
+    """Fetch wellness memory and build the Groq chat messages for the Wellness Coach."""
+    # Fetch wellness context from Pinecone
+    wellness_memories = get_wellness_memory(query=user_message, top_k=3, user_id=user_id)
+    context = format_wellness_context(wellness_memories) if wellness_memories else "No recent wellness data available."
+    
+    # Build biometric context if available
+    biometric_context = ""
+    if wellness_data:
+        biometric_context = _BIOMETRIC_CONTEXT_TMPL.format_map({**_BIOMETRIC_CONTEXT_DEFAULTS, **wellness_data})
+    
+    # Build user profile context
+    profile_context = ""
+    if user_profile:
+        profile_context = _PROFILE_CONTEXT_TMPL.format_map({**_PROFILE_CONTEXT_DEFAULTS, **user_profile})
+    
+    user_prompt = f"""User says: "{user_message}"
 {biometric_context}
 {profile_context}
 **Wellness History from Memory:**
 {context}
 
 Provide your analysis as the Wellness Coach."""
+    
+    return [
+        {"role": "system", "content": _CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _parse_wellness_chat_reply(result: str) -> dict:
+    """Turn the coach's raw completion into the chat response dict."""
+    # Try to parse as JSON
+    try:
+        # Find JSON object boundaries (first '{' to last '}') in one scan
+        match = _JSON_RE.search(result)
+        if match:
+            data = orjson.loads(match.group(0))
+            return {
+                "agentType": "Wellness Coach",
+                "content": data.get("summary", result), # Use summary as main content
+                "summary": data.get("recommendation", "Prioritize recovery.")
+            }
+        raise ValueError("No JSON found")
+    except Exception as e:
+        # If parsing fails, just return the text but clean it up
+        print(f"Wellness JSON Parse Error: {e}. Raw content: {result}")
+        clean_text = result.replace("```json", "").replace("```", "").strip()
+        return {
+            "agentType": "Wellness Coach",
+            "content": clean_text,
+            "summary": "Wellness Check Logged"
+        }
+
 
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            model="llama-3.1-8b-instant",
+def generate_wellness_chat_response(user_message: str, wellness_data: dict = None, user_profile: dict = None, user_id: str = "user_123") -> dict:
+    """
+    Generate a wellness coach chat response using AI.
+    
+    Args:
+        user_message: The user's message/question
+        wellness_data: Optional biometric data for context
+        user_profile: Optional user profile (calories, phase, etc.)
+        
+    Returns:
+        Dict with agentType, content, and summary
+    """
+    try:
+        # Repeat / near-duplicate questions are answered from the shared chat response cache
+        # (only when the caller didn't pass explicit biometrics, which the cache key ignores)
+        use_cache = wellness_data is None
+        query_vector = message_vector(user_message) if use_cache else None
+        if use_cache:
+            cached = chat_response_cache.get("wellness", user_id, user_message, query_vector)
+            if cached is not None:
+                return cached
+        
+        messages = _build_wellness_chat_messages(user_message, wellness_data, user_profile, user_id)
+
+        response = _GROQ.chat.completions.create(
+            messages=messages,
+            model=_CHAT_MODEL,
             temperature=0.5,
             max_tokens=300,
         )
         
-        result = response.choices[0].message.content
+        reply = _parse_wellness_chat_reply(response.choices[0].message.content)
         
-        # Try to parse as JSON
-        # Try to parse as JSON
-        try:
-            # Find JSON object boundaries
-            start = result.find('{')
-            end = result.rfind('}') + 1
-            if start != -1 and end != -1:
-                clean = result[start:end]
-                data = json.loads(clean)
-                return {
-                    "agentType": "Wellness Coach",
-                    "content": data.get("summary", result), # Use summary as main content
-                    "summary": data.get("recommendation", "Prioritize recovery.")
-                }
-            else:
-                raise ValueError("No JSON found")
-        except Exception as e:
-            # If parsing fails, just return the text but clean it up
-            print(f"Wellness JSON Parse Error: {e}. Raw content: {result}")
-            clean_text = result.replace("```json", "").replace("```", "").strip()
-            return {
-                "agentType": "Wellness Coach",
-                "content": clean_text,
-                "summary": "Wellness Check Logged"
-            }
+        if use_cache:
+            chat_response_cache.put("wellness", user_id, user_message, query_vector, reply)
+        return reply
             
     except Exception as e:
         print(f"Wellness AI error: {e}")
-        return {
-            "agentType": "Wellness Coach",
-            "content": "Unable to analyze wellness data at this time.",
-            "summary": "Please check wellness connection."
-        }
+        return dict(_FALLBACK_CHAT)
+
+
+def generate_wellness_chat_response_stream(user_message: str, wellness_data: dict = None, user_profile: dict = None, user_id: str = "user_123"):
+    """
+    Streaming variant of generate_wellness_chat_response for chat UIs.
+    
+    Yields ("delta", text) chunks as Groq produces the raw reply, then exactly one final event:
+    ("response", reply) with the reply parsed like generate_wellness_chat_response, or
+    ("error", fallback reply) if the stream failed (any deltas sent so far should be discarded).
+    A cached reply is yielded straight away as the "response" event, without deltas.
+    """
+    try:
+        use_cache = wellness_data is None
+        query_vector = message_vector(user_message) if use_cache else None
+        if use_cache:
+            cached = chat_response_cache.get("wellness", user_id, user_message, query_vector)
+            if cached is not None:
+                yield "response", cached
+                return
+        
+        messages = _build_wellness_chat_messages(user_message, wellness_data, user_profile, user_id)
+        
+        stream = _GROQ.chat.completions.create(
+            messages=messages,
+            model=_CHAT_MODEL,
+            temperature=0.5,
+            max_tokens=300,
+            stream=True,
+        )
+        parts = []
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield "delta", delta
+        
+        reply = _parse_wellness_chat_reply("".join(parts))
+        if use_cache:
+            chat_response_cache.put("wellness", user_id, user_message, query_vector, reply)
+        yield "response", reply
+                
+    except Exception as e:
+        print(f"Wellness AI error: {e}")
+        yield "error", dict(_FALLBACK_CHAT)
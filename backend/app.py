@@ -1,13 +1,15 @@
 import streamlit as st
 import os
-from crewai import Crew, Process
-from agents import FitnessAgents
-from tasks import FitnessTasks
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-load_dotenv(".env.local") # Explicitly load .env.local if present in parent or current dir
+# Load environment variables (once per server process, not on every Streamlit rerun)
+@st.cache_resource
+def _load_env():
+    load_dotenv()
+    load_dotenv(".env.local") # Explicitly load .env.local if present in parent or current dir
+    return True
+
+_load_env()
 
 st.set_page_config(page_title="Personal Trainer Agent", layout="wide")
 
@@ -58,6 +60,11 @@ with col2:
             with st.status("Initializing AI Crew...", expanded=True) as status:
                 st.write("Initializing Agents...")
                 try:
+                    # crewai is only imported once a session starts, so the page renders without it
+                    from crewai import Crew, Process
+                    from agents import FitnessAgents
+                    from tasks import FitnessTasks
+
                     # 1. Initialize
                     agents = FitnessAgents()
                     tasks = FitnessTasks()
@@ -1,8 +1,5 @@
 
 import os
-from crewai import Crew, Process
-from agents import FitnessAgents
-from tasks import FitnessTasks
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,6 +9,11 @@ def main():
     
     exercise_choice = input("What are we training today? (Squat/Pushup): ")
 
+    # Heavy imports (crewai pulls in langchain/pydantic) are deferred until after the prompt
+    from crewai import Crew, Process
+    from agents import FitnessAgents
+    from tasks import FitnessTasks
+
     # 1. Initialize
     agents = FitnessAgents()
     tasks = FitnessTasks()
@@ -9,6 +9,9 @@ from dotenv import load_dotenv
 load_dotenv(dotenv_path='../.env.local')
 load_dotenv() # Also load any .env in current directory if it exists
 
+# Pinecone recommends upserting at most ~100 vectors per request
+UPSERT_BATCH_SIZE = 100
+
 def seed_cloud_db():
     print("... Connecting to Pinecone Cloud")
     
@@ -50,17 +53,23 @@ def seed_cloud_db():
     ids = ["log_001", "log_002", "nutri_latest", "well_latest"]
     
     print("... Generating Embeddings & Uploading")
-    vectors_to_upsert = []
-    
-    for i, doc in enumerate(documents):
-        vector_values = embeddings.embed_query(doc)
-        vectors_to_upsert.append({
+    # One batched embedding call for all documents instead of one request per document.
+    # RETRIEVAL_QUERY matches embed_query, which the runtime uses for every write and search.
+    vector_values_list = embeddings.embed_documents(documents, task_type="RETRIEVAL_QUERY")
+    vectors_to_upsert = [
+        {
             "id": ids[i],
             "values": vector_values,
-            "metadata": {"text": doc} # Important: Store text to retrieve it later
-        })
+            "metadata": {"text": documents[i]} # Important: Store text to retrieve it later
+        }
+        for i, vector_values in enumerate(vector_values_list)
+    ]
 
-    index.upsert(vectors=vectors_to_upsert)
+    # Upsert in batches of UPSERT_BATCH_SIZE, sent concurrently, then wait for all of them
+    batches = [vectors_to_upsert[i:i + UPSERT_BATCH_SIZE] for i in range(0, len(vectors_to_upsert), UPSERT_BATCH_SIZE)]
+    pending = [index.upsert(vectors=batch, async_req=True) for batch in batches]
+    for request in pending:
+        request.get()
     print("✅ Success! Memory is now in the Cloud.")
 
 if __name__ == "__main__":
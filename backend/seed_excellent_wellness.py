@@ -13,34 +13,65 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import time
-from backend.tools.memory_store import save_agent_memory
-from backend.agents.wellness.brain import analyze_wellness
+import asyncio
+import numpy as np
+from backend.tools.memory_store import save_agent_memories_batch
+from backend.agents.wellness.brain import analyze_wellness_async
+
+# Banners are pre-joined so each is emitted with a single write
+_OPENING_BANNER = "\n".join([
+    "\n🌟 Creating EXCELLENT Wellness Demo Data",
+    "=" * 60
+])
+
+_CLOSING_BANNER = "\n".join([
+    "\n" + "=" * 60,
+    "✨ DEMO DATA CREATED SUCCESSFULLY!",
+    "\n🎯 Expected Result:",
+    "   - Weekly plan will show VOLUME INCREASE (+10%)",
+    "   - Adjustment reason: 'Volume increased 10% - excellent recovery status'",
+    "   - No injury warnings",
+    "=" * 60
+])
+
+
+async def _analyze_all(wellness_inputs):
+    """Run all Gemini analyses concurrently (each is an independent network call)."""
+    return await asyncio.gather(*(analyze_wellness_async(d) for d in wellness_inputs))
 
 def main():
-    print("\n🌟 Creating EXCELLENT Wellness Demo Data")
-    print("=" * 60)
+    sys.stdout.write(_OPENING_BANNER + "\n")
     
     # 1. Create excellent wellness entries (last 5 days)
     print("\n📊 Creating Wellness Logs with EXCELLENT metrics...")
-    for i in range(5):
-        wellness_data = {
-            "sleep_hours": 8.0 + (i * 0.2),  # 8.0 to 8.8 hours
-            "hrv": 65 + i,  # 65-69 ms (excellent)
-            "rhr": 58 - i   # 58-54 bpm (low, excellent)
-        }
-        
-        analysis = analyze_wellness(wellness_data)
-        date_str = time.strftime('%Y-%m-%d', time.localtime(time.time() - (i * 86400)))
-        
+    # Per-day values and dates are computed as arrays; .tolist() keeps them native for Pinecone metadata
+    days = np.arange(5)
+    sleep_hours = (8.0 + 0.2 * days).tolist()  # 8.0 to 8.8 hours
+    hrv = (65 + days).tolist()  # 65-69 ms (excellent)
+    rhr = (58 - days).tolist()  # 58-54 bpm (low, excellent)
+    date_strs = [time.strftime('%Y-%m-%d', time.localtime(t)) for t in (time.time() - 86400 * days).tolist()]
+    
+    wellness_inputs = [
+        {"sleep_hours": s, "hrv": h, "rhr": r}
+        for s, h, r in zip(sleep_hours, hrv, rhr)
+    ]
+    analyses = asyncio.run(_analyze_all(wellness_inputs))
+    
+    # All memories are collected here and saved with one embed + upsert at the end;
+    # each entry keeps the summary line printed once its ID is known
+    entries = []
+    summaries = []
+    
+    for i, (wellness_data, analysis, date_str) in enumerate(zip(wellness_inputs, analyses, date_strs)):
         text_content = f"""Wellness ({date_str}): {analysis.get('executive_summary')}
 Readiness: {analysis.get('readiness_score')}/100
 Sleep: {wellness_data['sleep_hours']}h, HRV: {wellness_data['hrv']}ms, RHR: {wellness_data['rhr']}bpm
 Status: EXCELLENT - Ready for volume increase"""
         
-        log_id = save_agent_memory(
-            agent_type="wellness",
-            content=text_content,
-            metadata={
+        entries.append({
+            "agent_type": "wellness",
+            "content": text_content,
+            "metadata": {
                 "type": "wellness",
                 "user_id": "user_123",
                 "sleep_hours": wellness_data["sleep_hours"],
@@ -50,29 +81,26 @@ Status: EXCELLENT - Ready for volume increase"""
                 "executive_summary": analysis.get('executive_summary', '')[:500],
                 "date": date_str
             }
-        )
-        print(f"   ✅ Day {i+1}: Sleep {wellness_data['sleep_hours']:.1f}h, HRV {wellness_data['hrv']}, Readiness {analysis.get('readiness_score')}/100 - {log_id}")
+        })
+        summaries.append(f"   ✅ Day {i+1}: Sleep {wellness_data['sleep_hours']:.1f}h, HRV {wellness_data['hrv']}, Readiness {analysis.get('readiness_score')}/100")
     
     # 2. Create excellent workout logs (no injuries, good form)
-    print("\n🏋️ Creating Excellent Workout Logs...")
     workouts = [
         {"exercise": "Squat", "reps": 12, "rating": 9, "issues": []},
         {"exercise": "Pushup", "reps": 20, "rating": 9, "issues": []},
         {"exercise": "Squat", "reps": 10, "rating": 8, "issues": []}
     ]
     
-    for i, workout in enumerate(workouts):
-        date_str = time.strftime('%Y-%m-%d', time.localtime(time.time() - (i * 86400)))
-        
+    for workout, date_str in zip(workouts, date_strs):
         text_content = f"""Exercise ({date_str}): {workout['exercise']}
 Reps: {workout['reps']}, Rating: {workout['rating']}/10
 Issues: None - Excellent form maintained
 Status: READY FOR PROGRESSION"""
         
-        log_id = save_agent_memory(
-            agent_type="trainer",
-            content=text_content,
-            metadata={
+        entries.append({
+            "agent_type": "trainer",
+            "content": text_content,
+            "metadata": {
                 "type": "exercise",
                 "exercise": workout["exercise"],
                 "reps": workout["reps"],
@@ -80,31 +108,30 @@ Status: READY FOR PROGRESSION"""
                 "issues": workout["issues"],
                 "date": date_str
             }
-        )
-        print(f"   ✅ {workout['exercise']}: {workout['reps']} reps, Rating {workout['rating']}/10 - {log_id}")
+        })
+        summaries.append(f"   ✅ {workout['exercise']}: {workout['reps']} reps, Rating {workout['rating']}/10")
     
     # 3. Create user profile
-    print("\n👤 Creating User Profile...")
-    profile_id = save_agent_memory(
-        agent_type="user_profile",
-        content="User: 2500 cal/day, bulking phase, 180g protein. Excellent recovery capacity.",
-        metadata={
+    entries.append({
+        "agent_type": "user_profile",
+        "content": "User: 2500 cal/day, bulking phase, 180g protein. Excellent recovery capacity.",
+        "metadata": {
             "type": "user_profile",
             "calories": 2500,
             "phase": "bulking",
             "protein_target": 180,
             "notes": "Excellent recovery capacity"
         }
-    )
-    print(f"   ✅ Profile: 2500 cal, Bulking, 180g protein - {profile_id}")
+    })
+    summaries.append("   ✅ Profile: 2500 cal, Bulking, 180g protein")
+    
+    # 4. Save everything in one batch
+    print("\n💾 Saving wellness logs, workout logs and profile...")
+    log_ids = save_agent_memories_batch(entries)
+    for summary, log_id in zip(summaries, log_ids):
+        print(f"{summary} - {log_id}")
     
-    print("\n" + "=" * 60)
-    print("✨ DEMO DATA CREATED SUCCESSFULLY!")
-    print("\n🎯 Expected Result:")
-    print("   - Weekly plan will show VOLUME INCREASE (+10%)")
-    print("   - Adjustment reason: 'Volume increased 10% - excellent recovery status'")
-    print("   - No injury warnings")
-    print("=" * 60)
+    sys.stdout.write(_CLOSING_BANNER + "\n")
 
 if __name__ == "__main__":
     main()
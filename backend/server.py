@@ -12,58 +12,81 @@ load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
 from fastapi.middleware.cors import CORSMiddleware
 
 from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
-from crewai import Crew, Process
 
 # Updated Imports
-from backend.agents.physical_trainer.agent import PhysicalTrainerAgent
-from backend.agents.physical_trainer.tasks import PhysicalTrainerTasks
-from backend.agents.nutritionist.agent import NutritionistAgent
-from backend.agents.nutritionist.data_loader import FoodDataLoader
-from backend.agents.nutritionist.retrieval import DietRetriever
-from backend.agents.nutritionist.scanner import analyze_food_image
-from backend.agents.wellness.brain import analyze_wellness, generate_wellness_chat_response
-
-import threading
+# (crewai, the trainer agent and the nutritionist data stack are imported where they are used,
+# so endpoints that never touch them don't load them at startup)
+from backend.agents.wellness.brain import analyze_wellness, generate_wellness_chat_response, generate_wellness_chat_response_stream
+
+import asyncio
+import contextlib
+import atexit
+import copy
+import uuid
 import re
 import time
 import json
-from pinecone import Pinecone
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from groq import Groq
-from groq import Groq
-from backend.tools.memory_store import get_exercise_memory, get_nutrition_memory, get_wellness_memory, format_exercise_context, format_wellness_context, initialize_user_namespace, save_agent_memory
+import logging
+import queue
+import orjson
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+import httpx
+import numpy as np
+from diskcache import Cache
+from groq import Groq, AsyncGroq
+from backend.tools.memory_store import _get_index, _get_embeddings, _embed_query, EMBEDDING_TASK_TYPE, get_profile_query_vector, get_exercise_memory, get_nutrition_memory, get_wellness_memory, format_exercise_context, format_wellness_context, initialize_user_namespace, save_agent_memory, save_agent_memories_batch, get_training_plan_memory, save_training_plan
+from backend.tools.chat_cache import chat_response_cache, message_vector
 import backend.session_state as session_state
 
+# Logging: handlers only enqueue records; a background listener thread does the actual
+# stream writes, so request handlers never block on stdout/stderr
+logger = logging.getLogger(__name__)
+_backend_logger = logging.getLogger("backend")
+if not _backend_logger.handlers:
+    _log_queue = queue.SimpleQueue()
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = QueueListener(_log_queue, _log_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    _backend_logger.addHandler(QueueHandler(_log_queue))
+    _backend_logger.setLevel(os.environ.get("LOG_LEVEL", "INFO").upper())
+    _backend_logger.propagate = False
+
+# The outermost {...} span of an LLM reply (greedy, across lines)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
+
 def extract_json(text):
     """
     Robustly extract JSON from a string, handling markdown code blocks and extra text.
     """
-    try:
-        # First try direct parse
-        return json.loads(text)
-    except:
-        pass
-    
-    # Try cleaning markdown
-    try:
-        clean = text.replace("```json", "").replace("```", "").strip()
-        return json.loads(clean)
-    except:
-        pass
+    if not text:
+        return None
 
-    # Try finding the first { and last }
+    # First try direct parse
     try:
-        start = text.find('{')
-        end = text.rfind('}') + 1
-        if start != -1 and end != -1:
-             return json.loads(text[start:end])
-    except:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
-        
+
+    # Take the first { .. last } span and parse that once (markdown fences sit outside
+    # the braces, so they never need stripping into a new string)
+    match = _JSON_OBJECT_RE.search(text)
+    if match:
+        try:
+            return orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            pass
+
     return None
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Input Validation: Allow all origins for development to fix CORS issues
 origins = [
@@ -102,7 +125,7 @@ class NutritionRequest(BaseModel):
 
 @app.post("/api/user/onboarding")
 async def onboarding_user(request: dict):
-    print(f"🚀 Starting user onboarding for: {request.get('user_id')}")
+    logger.info("[INFO] Starting user onboarding for: %s", request.get('user_id'))
     try:
         user_id = request.get('user_id')
         email = request.get('email', 'unknown@example.com')
@@ -141,11 +164,11 @@ async def onboarding_user(request: dict):
         
         time.sleep(1) # Intentional small delay to ensure Pinecone indexing starts logic
         
-        print(f"✅ Onboarding complete for {user_id}. Log: {log_id}")
+        logger.info("[OK] Onboarding complete for %s. Log: %s", user_id, log_id)
         return {"status": "success", "message": "User setup complete", "log_id": log_id}
         
     except Exception as e:
-        print(f"❌ Onboarding error: {e}")
+        logger.error("[ERR] Onboarding error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     fitness_coach_plan: str = ""
     user_id: str
@@ -226,16 +249,26 @@ def format_trainer_chat_response(trainer_data, log_id):
         "source_log_id": log_id
     }
 
+# Exercise keywords -> intent label. All keywords are folded into one compiled alternation,
+# so the text is scanned once no matter how many exercises the table grows to.
+_EXERCISE_KEYWORDS = {
+    "pushup": "Pushup",
+    "push-ups": "Pushup",
+    "push up": "Pushup",
+    "squat": "Squat",
+}
+_EXERCISE_RE = re.compile("|".join(map(re.escape, _EXERCISE_KEYWORDS)), re.IGNORECASE)
+_EXERCISE_PRIORITY = ("Pushup", "Squat")
+
 def detect_exercise_intent(text: str):
     """
     Simple keyword detection for exercise intent.
     Returns 'Pushup', 'Squat', or None.
     """
-    t = text.lower()
-    if "pushup" in t or "push-ups" in t or "push up" in t:
-        return "Pushup"
-    if "squat" in t:
-        return "Squat"
+    found = {_EXERCISE_KEYWORDS[m.group(0).lower()] for m in _EXERCISE_RE.finditer(text)}
+    for label in _EXERCISE_PRIORITY:
+        if label in found:
+            return label
     return None
 
 def default_multiagent_orchestrator(message: str):
@@ -256,23 +289,31 @@ def default_multiagent_orchestrator(message: str):
         "source_log_id": None
     }
 
-def generate_trainer_chat_response(user_message: str, user_profile: dict = None, user_id: str = None) -> dict:
-    """
-    Generate a trainer response using AI based on Pinecone exercise memory.
-    """
-    try:
-        # Fetch exercise context from Pinecone
-        exercise_memories = get_exercise_memory(query=user_message, top_k=3, user_id=user_id)
-        context = format_exercise_context(exercise_memories) if exercise_memories else "No recent workout data available."
-        
-        # Build user profile context
-        profile_context = ""
-        if user_profile:
-            profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')}\n- Protein Target: {user_profile.get('protein_target', 'Not set')}g\n"
-        
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        
-        system_prompt = """You are an expert Physical Trainer AI assistant. You analyze workout performance and provide personalized advice.
+# Connection pool sizing for the Groq clients: /api/chat and /api/chat/stream fan out
+# several LLM calls at once, so allow plenty of concurrent sockets and keep them warm
+# between bursts instead of re-handshaking
+_GROQ_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+_GROQ_TIMEOUT = httpx.Timeout(30.0)
+
+@lru_cache(maxsize=1)
+def _get_groq_client() -> Groq:
+    """Get the shared Groq client (singleton, so its HTTP connection pool is reused)."""
+    return Groq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        http_client=httpx.Client(limits=_GROQ_POOL_LIMITS, timeout=_GROQ_TIMEOUT)
+    )
+
+@lru_cache(maxsize=1)
+def _get_async_groq_client() -> AsyncGroq:
+    """Get the shared AsyncGroq client used by the chat agents (awaited on the event loop)."""
+    return AsyncGroq(
+        api_key=os.getenv("GROQ_API_KEY"),
+        http_client=httpx.AsyncClient(limits=_GROQ_POOL_LIMITS, timeout=_GROQ_TIMEOUT)
+    )
+
+# Chat agent system prompts. Kept static and byte-identical across requests (everything
+# per-user goes in the user message) so Groq's prompt prefix cache can reuse them.
+TRAINER_CHAT_SYSTEM_PROMPT = """You are an expert Physical Trainer AI assistant. You analyze workout performance and provide personalized advice.
 
 Based on the user's message, workout history, and profile (calories/phase), provide:
 1. A brief analysis of their current fitness status
@@ -281,82 +322,130 @@ Based on the user's message, workout history, and profile (calories/phase), prov
 Keep responses concise (2-3 sentences for summary, 1-2 for recommendation).
 Format your response as JSON with keys: "summary" (string), "recommendation" (string)"""
 
-        user_prompt = f"""User says: "{user_message}"
+NUTRITIONIST_CHAT_SYSTEM_PROMPT = """You are an expert Indian Nutritionist AI assistant. You provide personalized nutrition advice based on the user's fitness goals, workout history, and calorie phase (cutting/bulking/maintenance).
+
+Based on the context and user's phase, provide:
+1. A brief nutrition analysis or recommendation tailored to their calorie goals
+2. A specific actionable suggestion for their current phase
+
+Keep responses concise (2-3 sentences for summary, 1-2 for recommendation).
+Format your response as JSON with keys: "summary" (string), "recommendation" (string)"""
+
+COMBINED_CHAT_SYSTEM_PROMPT = """You are two experts answering the same user together:
+- An expert Physical Trainer who analyzes workout performance and gives personalized training advice.
+- An expert Indian Nutritionist who gives personalized nutrition advice for the user's calorie phase (cutting/bulking/maintenance).
+
+For each expert, provide:
+1. A brief analysis (trainer: current fitness status; nutritionist: nutrition tailored to their calorie goals)
+2. A specific actionable recommendation for their goals and current phase
+
+Keep responses concise (2-3 sentences for summary, 1-2 for recommendation).
+Format your response as JSON: {"trainer": {"summary": string, "recommendation": string}, "nutritionist": {"summary": string, "recommendation": string}}"""
+
+# Fixed sampling seed for the chat completions (stable outputs for identical prompts)
+CHAT_COMPLETION_SEED = 42
+
+async def _build_trainer_chat_messages(user_message: str, user_profile: dict = None, user_id: str = None) -> list:
+    """Build the trainer's Groq chat messages from Pinecone exercise memory and the user profile."""
+    # Fetch exercise context from Pinecone (sync client, so keep it off the event loop)
+    exercise_memories = await asyncio.to_thread(get_exercise_memory, query=user_message, top_k=3, user_id=user_id)
+    context = format_exercise_context(exercise_memories) if exercise_memories else "No recent workout data available."
+    
+    # Build user profile context
+    profile_context = ""
+    if user_profile:
+        profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')}\n- Protein Target: {user_profile.get('protein_target', 'Not set')}g\n"
+    
+    user_prompt = f"""User says: "{user_message}"
 {profile_context}
 **Workout History from Memory:**
 {context}
 
 Provide your analysis as the Physical Trainer."""
 
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+    return [
+        {"role": "system", "content": TRAINER_CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def _trainer_chat_reply(result: str, data: dict = None) -> dict:
+    """Turn the trainer's raw completion (or its already-parsed JSON) into the chat response dict."""
+    # Try to parse as JSON
+    if data is None:
+        data = extract_json(result)
+    if data:
+        return {
+            "agentType": "Physical Trainer",
+            "content": data.get("summary", result),
+            "summary": data.get("recommendation", "Focus on form and consistency.")
+        }
+    # Fallback if no JSON found
+    return {
+        "agentType": "Physical Trainer",
+        "content": result,
+        "summary": "Continue training mindfully."
+    }
+
+async def generate_trainer_chat_response(user_message: str, user_profile: dict = None, user_id: str = None) -> dict:
+    """
+    Generate a trainer response using AI based on Pinecone exercise memory.
+    """
+    try:
+        # Repeat / near-duplicate questions are answered from the response cache; the message
+        # vector is the same LRU-cached embedding the memory lookups below use
+        query_vector = await asyncio.to_thread(message_vector, user_message)
+        cached = chat_response_cache.get("trainer", user_id, user_message, query_vector)
+        if cached is not None:
+            return cached
+        
+        messages = await _build_trainer_chat_messages(user_message, user_profile, user_id)
+        
+        client = _get_async_groq_client()
+        
+        response = await client.chat.completions.create(
+            messages=messages,
             model="llama-3.1-8b-instant",
             temperature=0.5,
             max_tokens=300,
+            seed=CHAT_COMPLETION_SEED,
         )
         
-        result = response.choices[0].message.content
-        
-        # Try to parse as JSON
-        data = extract_json(result)
-        if data:
-            return {
-                "agentType": "Physical Trainer",
-                "content": data.get("summary", result),
-                "summary": data.get("recommendation", "Focus on form and consistency.")
-            }
-        else:
-             # Fallback if no JSON found
-             return {
-                "agentType": "Physical Trainer",
-                "content": result,
-                "summary": "Continue training mindfully."
-            }
+        reply = _trainer_chat_reply(response.choices[0].message.content)
+        chat_response_cache.put("trainer", user_id, user_message, query_vector, reply)
+        return reply
             
     except Exception as e:
-        print(f"Trainer AI error: {e}")
+        logger.error("Trainer AI error: %s", e)
         return {
             "agentType": "Physical Trainer",
             "content": "Unable to analyze workout data at this time.",
             "summary": "Please check trainer connection."
         }
 
-def generate_nutritionist_chat_response(user_message: str, user_profile: dict = None, user_id: str = None) -> dict:
-    """
-    Generate a nutritionist response using AI based on Pinecone memory.
-    """
-    try:
-        # Fetch both exercise and nutrition context
-        exercise_memories = get_exercise_memory(query=user_message, top_k=2, user_id=user_id)
-        nutrition_memories = get_nutrition_memory(query=user_message, top_k=2, user_id=user_id)
-        
-        exercise_context = format_exercise_context(exercise_memories) if exercise_memories else "No recent workout data."
-        nutrition_context = ""
-        if nutrition_memories:
-            nutrition_context = "\n".join([f"- {m.get('text', '')[:200]}" for m in nutrition_memories])
-        else:
-            nutrition_context = "No recent nutrition plans."
-        
-        # Build user profile context
-        profile_context = ""
-        if user_profile:
-            profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')} (cutting/bulking/maintenance)\n- Protein Target: {user_profile.get('protein_target', 'Not set')}g\n"
-        
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        
-        system_prompt = """You are an expert Indian Nutritionist AI assistant. You provide personalized nutrition advice based on the user's fitness goals, workout history, and calorie phase (cutting/bulking/maintenance).
-
-Based on the context and user's phase, provide:
-1. A brief nutrition analysis or recommendation tailored to their calorie goals
-2. A specific actionable suggestion for their current phase
-
-Keep responses concise (2-3 sentences for summary, 1-2 for recommendation).
-Format your response as JSON with keys: "summary" (string), "recommendation" (string)"""
-
-        user_prompt = f"""User says: "{user_message}"
+async def _build_nutritionist_chat_messages(user_message: str, user_profile: dict = None, user_id: str = None) -> list:
+    """Build the nutritionist's Groq chat messages from Pinecone exercise/nutrition memory and the user profile."""
+    # Fetch both exercise and nutrition context concurrently. Both lookups embed the same
+    # message, so warm the embedding LRU first: they then share one vector instead of
+    # racing each other into two embedding calls.
+    await asyncio.to_thread(message_vector, user_message)
+    exercise_memories, nutrition_memories = await asyncio.gather(
+        asyncio.to_thread(get_exercise_memory, query=user_message, top_k=2, user_id=user_id),
+        asyncio.to_thread(get_nutrition_memory, query=user_message, top_k=2, user_id=user_id)
+    )
+    
+    exercise_context = format_exercise_context(exercise_memories) if exercise_memories else "No recent workout data."
+    nutrition_context = ""
+    if nutrition_memories:
+        nutrition_context = "\n".join([f"- {m.get('text', '')[:200]}" for m in nutrition_memories])
+    else:
+        nutrition_context = "No recent nutrition plans."
+    
+    # Build user profile context
+    profile_context = ""
+    if user_profile:
+        profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')} (cutting/bulking/maintenance)\n- Protein Target: {user_profile.get('protein_target', 'Not set')}g\n"
+    
+    user_prompt = f"""User says: "{user_message}"
 {profile_context}
 **Recent Workout Data:**
 {exercise_context}
@@ -366,64 +455,175 @@ Format your response as JSON with keys: "summary" (string), "recommendation" (st
 
 Provide your nutrition advice based on their cutting/bulking/maintenance phase."""
 
-        response = client.chat.completions.create(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+    return [
+        {"role": "system", "content": NUTRITIONIST_CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+def _nutritionist_chat_reply(result: str, data: dict = None) -> dict:
+    """Turn the nutritionist's raw completion (or its already-parsed JSON) into the chat response dict."""
+    # Try to parse as JSON
+    if data is None:
+        data = extract_json(result)
+    if data:
+        return {
+            "agentType": "Nutritionist",
+            "content": data.get("summary", result),
+            "summary": data.get("recommendation", "Maintain balanced nutrition.")
+        }
+    return {
+        "agentType": "Nutritionist",
+        "content": result,
+        "summary": "Focus on protein and hydration."
+    }
+
+async def generate_nutritionist_chat_response(user_message: str, user_profile: dict = None, user_id: str = None) -> dict:
+    """
+    Generate a nutritionist response using AI based on Pinecone memory.
+    """
+    try:
+        # Repeat / near-duplicate questions are answered from the response cache; the message
+        # vector is the same LRU-cached embedding the memory lookups below use
+        query_vector = await asyncio.to_thread(message_vector, user_message)
+        cached = chat_response_cache.get("nutritionist", user_id, user_message, query_vector)
+        if cached is not None:
+            return cached
+        
+        messages = await _build_nutritionist_chat_messages(user_message, user_profile, user_id)
+        
+        client = _get_async_groq_client()
+        
+        response = await client.chat.completions.create(
+            messages=messages,
             model="llama-3.1-8b-instant",
             temperature=0.5,
             max_tokens=300,
+            seed=CHAT_COMPLETION_SEED,
         )
         
-        result = response.choices[0].message.content
-        
-        # Try to parse as JSON
-        data = extract_json(result)
-        if data:
-            return {
-                "agentType": "Nutritionist",
-                "content": data.get("summary", result),
-                "summary": data.get("recommendation", "Maintain balanced nutrition.")
-            }
-        else:
-             return {
-                "agentType": "Nutritionist",
-                "content": result,
-                "summary": "Focus on protein and hydration."
-            }
+        reply = _nutritionist_chat_reply(response.choices[0].message.content)
+        chat_response_cache.put("nutritionist", user_id, user_message, query_vector, reply)
+        return reply
             
     except Exception as e:
-        print(f"Nutritionist AI error: {e}")
+        logger.error("Nutritionist AI error: %s", e)
         return {
             "agentType": "Nutritionist",
             "content": "Unable to provide nutrition advice at this time.",
             "summary": "Please check nutritionist connection."
         }
 
+async def _build_combined_chat_messages(user_message: str, user_profile: dict = None, user_id: str = None) -> list:
+    """Build one Groq prompt that answers as both the trainer and the nutritionist."""
+    # Warm the embedding LRU, then run both memory lookups on the shared vector
+    await asyncio.to_thread(message_vector, user_message)
+    exercise_memories, nutrition_memories = await asyncio.gather(
+        asyncio.to_thread(get_exercise_memory, query=user_message, top_k=3, user_id=user_id),
+        asyncio.to_thread(get_nutrition_memory, query=user_message, top_k=2, user_id=user_id)
+    )
+    
+    exercise_context = format_exercise_context(exercise_memories) if exercise_memories else "No recent workout data available."
+    if nutrition_memories:
+        nutrition_context = "\n".join([f"- {m.get('text', '')[:200]}" for m in nutrition_memories])
+    else:
+        nutrition_context = "No recent nutrition plans."
+    
+    # Build user profile context
+    profile_context = ""
+    if user_profile:
+        profile_context = f"\n**User Profile:**\n- Daily Calories: {user_profile.get('calories', 'Not set')} kcal\n- Phase: {user_profile.get('phase', 'Not set')} (cutting/bulking/maintenance)\n- Protein Target: {user_profile.get('protein_target', 'Not set')}g\n"
+    
+    user_prompt = f"""User says: "{user_message}"
+{profile_context}
+**Workout History from Memory:**
+{exercise_context}
+
+**Recent Nutrition Plans:**
+{nutrition_context}
+
+Provide the Physical Trainer's analysis and the Nutritionist's advice."""
+
+    return [
+        {"role": "system", "content": COMBINED_CHAT_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+async def generate_trainer_nutritionist_chat_responses(user_message: str, user_profile: dict = None, user_id: str = None) -> tuple:
+    """
+    Generate the trainer and nutritionist responses with a single Groq call.
+    Both agents share the user message, profile and workout memory, so one completion
+    costs one round-trip and one prompt prefill instead of two.
+    Falls back to the per-agent calls when only one reply is cached or the combined JSON is incomplete.
+    """
+    query_vector = await asyncio.to_thread(message_vector, user_message)
+    trainer_reply = chat_response_cache.get("trainer", user_id, user_message, query_vector)
+    nutritionist_reply = chat_response_cache.get("nutritionist", user_id, user_message, query_vector)
+    
+    if trainer_reply is None and nutritionist_reply is None:
+        try:
+            messages = await _build_combined_chat_messages(user_message, user_profile, user_id)
+            client = _get_async_groq_client()
+            response = await client.chat.completions.create(
+                messages=messages,
+                model="llama-3.1-8b-instant",
+                temperature=0.5,
+                max_tokens=500,
+                seed=CHAT_COMPLETION_SEED,
+                response_format={"type": "json_object"},
+            )
+            result = response.choices[0].message.content
+            data = extract_json(result) or {}
+            trainer_data, nutritionist_data = data.get("trainer"), data.get("nutritionist")
+            
+            if isinstance(trainer_data, dict) and isinstance(nutritionist_data, dict):
+                trainer_reply = _trainer_chat_reply(result, trainer_data)
+                nutritionist_reply = _nutritionist_chat_reply(result, nutritionist_data)
+                chat_response_cache.put("trainer", user_id, user_message, query_vector, trainer_reply)
+                chat_response_cache.put("nutritionist", user_id, user_message, query_vector, nutritionist_reply)
+                return trainer_reply, nutritionist_reply
+            logger.warning("[WARN] Combined trainer/nutritionist reply incomplete, asking each agent separately")
+        except Exception as e:
+            logger.error("Combined trainer/nutritionist AI error: %s", e)
+    
+    # Partial cache hit or failed combined call: generate only what is missing
+    if trainer_reply is None and nutritionist_reply is None:
+        return await asyncio.gather(
+            generate_trainer_chat_response(user_message, user_profile, user_id=user_id),
+            generate_nutritionist_chat_response(user_message, user_profile, user_id=user_id)
+        )
+    if trainer_reply is None:
+        trainer_reply = await generate_trainer_chat_response(user_message, user_profile, user_id=user_id)
+    if nutritionist_reply is None:
+        nutritionist_reply = await generate_nutritionist_chat_response(user_message, user_profile, user_id=user_id)
+    return trainer_reply, nutritionist_reply
+
+def _log_timestamp(match) -> int:
+    """Unix timestamp of a trainer log match (metadata first, then the log_{timestamp} ID)."""
+    metadata = match.get('metadata') or {}
+    timestamp = metadata.get('timestamp', metadata.get('created_timestamp'))
+    if timestamp is not None:
+        return int(timestamp)
+    _, sep, rest = match['id'].partition('_')
+    return int(rest.split('_', 1)[0]) if sep else 0
+
 def get_latest_trainer_log(exercise: str, query: str, api_key: str, pinecone_key: str):
     try:
-        pc = Pinecone(api_key=pinecone_key)
-        index_name = os.environ.get("PINECONE_INDEX_NAME")
-        if not index_name:
-            print("⚠️ PINECONE_INDEX_NAME not set.")
+        if not os.environ.get("PINECONE_INDEX_NAME"):
+            logger.warning("[WARN] PINECONE_INDEX_NAME not set.")
             return None
             
-        index = pc.Index(index_name)
-        
-        embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004",
-            google_api_key=api_key
-        )
+        # Shared process-wide index handle (no per-call Pinecone client setup)
+        index = _get_index()
         
-        # Embed the user query to find semantically relevant logs
-        vector_values = embeddings.embed_query(query)
+        # Embed the user query to find semantically relevant logs (LRU-cached per normalized text)
+        vector_values = _embed_query(query)
         
         # Query Pinecone with filter
-        # We fetch top_k=10 to ensure we find the most recent one among relevant matches
+        # A small candidate set is enough: recency is read from the numeric "timestamp"
+        # metadata written with each log, not recovered by over-fetching
         results = index.query(
             vector=vector_values,
-            top_k=10,
+            top_k=3,
             filter={"exercise": exercise},
             include_metadata=True
         )
@@ -431,18 +631,12 @@ def get_latest_trainer_log(exercise: str, query: str, api_key: str, pinecone_key
         if not results['matches']:
             return None
             
-        # Sort by timestamp in ID (format: log_{timestamp})
-        # We assume IDs are reliable.
-        sorted_matches = sorted(
-            results['matches'], 
-            key=lambda x: int(x['id'].split('_')[1]) if '_' in x['id'] else 0, 
-            reverse=True
-        )
-        
-        return sorted_matches[0]
+        # Most recent by the timestamp metadata, falling back to the ID (format: log_{timestamp})
+        # for logs written before the field existed; a single max() pass, no sort
+        return max(results['matches'], key=_log_timestamp)
         
     except Exception as e:
-        print(f"Error querying Pinecone: {e}")
+        logger.error("Error querying Pinecone: %s", e)
         return None
 
 @app.post("/api/auth/signup")
@@ -451,7 +645,7 @@ async def signup_handler(request: SignupRequest):
     Handle user signup: Just acknowledge the signup.
     Namespace initialization will happen during onboarding for better performance.
     """
-    print(f"📝 Signup request for: {request.name} ({request.email})")
+    logger.info("[INFO] Signup request for: %s (%s)", request.name, request.email)
     
     # Skip initialize_user_namespace - will be done during onboarding
     # This saves ~400-500ms per signup
@@ -466,14 +660,12 @@ async def onboarding_handler(request: OnboardingRequest):
     This includes physical stats and calculated calorie targets.
     Also creates a user_profile record for the profile page.
     """
-    from backend.tools.memory_store import _get_index, _get_embeddings
-    import time
-    
-    print(f"📋 Onboarding data received for user: {request.user_id}")
+    logger.info("[INFO] Onboarding data received for user: %s", request.user_id)
     
     try:
         index = _get_index()
         embeddings = _get_embeddings()
+        now = int(time.time())
         
         # Create onboarding settings document
         onboarding_text = f"""User Onboarding Settings:
@@ -488,9 +680,6 @@ Calculated Daily Calories: {request.calculated_calories} kcal
 This user is aiming to {request.goal} weight with a {request.activity_level} activity level.
 """
         
-        # Embed the settings
-        vector = embeddings.embed_query(onboarding_text)
-        
         # Prepare metadata for user_settings
         settings_metadata = {
             "type": "user_settings",
@@ -501,17 +690,12 @@ This user is aiming to {request.goal} weight with a {request.activity_level} act
             "goal": request.goal,
             "activity_level": request.activity_level,
             "calculated_calories": request.calculated_calories,
-            "created_timestamp": int(time.time()),
+            "created_timestamp": now,
             "text": onboarding_text
         }
         
-        # Store user_settings in Pinecone under user's namespace
-        settings_vector_id = f"onboarding_{request.user_id}_{int(time.time())}"
-        
-        index.upsert(
-            vectors=[(settings_vector_id, vector, settings_metadata)],
-            namespace=request.user_id
-        )
+        # user_settings record ID (stored in the user's namespace below)
+        settings_vector_id = f"onboarding_{request.user_id}_{now}"
         
         # NOW ALSO CREATE user_profile record for profile page
         # Map onboarding data to profile format
@@ -534,9 +718,6 @@ Protein Target: {protein_target}g per day
 This profile was automatically created from onboarding data.
 """
         
-        # Embed the profile
-        profile_vector = embeddings.embed_query(profile_text)
-        
         # Prepare metadata for user_profile
         profile_metadata = {
             "type": "user_profile",
@@ -544,21 +725,28 @@ This profile was automatically created from onboarding data.
             "phase": phase,
             "protein_target": protein_target,
             "notes": f"Auto-generated from onboarding: {request.goal} weight, {request.activity_level} activity level",
-            "created_timestamp": int(time.time()),
+            "created_timestamp": now,
             "text": profile_text
         }
         
-        # Store user_profile in Pinecone
-        profile_vector_id = f"profile_{request.user_id}_{int(time.time())}"
+        profile_vector_id = f"profile_{request.user_id}_{now}"
         
+        # Embed both documents in one request and store user_settings + user_profile
+        # in Pinecone with a single upsert under the user's namespace
+        vector, profile_vector = embeddings.embed_documents([onboarding_text, profile_text], task_type=EMBEDDING_TASK_TYPE)
         index.upsert(
-            vectors=[(profile_vector_id, profile_vector, profile_metadata)],
+            vectors=[
+                (settings_vector_id, vector, settings_metadata),
+                (profile_vector_id, profile_vector, profile_metadata)
+            ],
             namespace=request.user_id
         )
+        _user_data_cache.evict("profile")  # Drop cached profile lookups so the next read sees this save
+        chat_response_cache.clear_user(request.user_id)  # Cached chat answers were tailored to the old profile
         
-        print(f"✅ Onboarding data saved for user {request.user_id}")
-        print(f"   Calories: {request.calculated_calories} kcal, Goal: {request.goal} → Phase: {phase}")
-        print(f"   Protein Target: {protein_target}g")
+        logger.info("[OK] Onboarding data saved for user %s", request.user_id)
+        logger.info("   Calories: %s kcal, Goal: %s -> Phase: %s", request.calculated_calories, request.goal, phase)
+        logger.info("   Protein Target: %sg", protein_target)
         
         return {
             "status": "success",
@@ -569,9 +757,35 @@ This profile was automatically created from onboarding data.
         }
         
     except Exception as e:
-        print(f"❌ Error saving onboarding data: {e}")
+        logger.error("[ERR] Error saving onboarding data: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to save onboarding data: {str(e)}")
 
+# Per-agent deadlines for /api/chat (seconds). The manager gets longer since it runs a Gemini
+# call plus a profile upsert and is usually served from the briefing cache anyway.
+CHAT_AGENT_TIMEOUT = 8.0
+MANAGER_BRIEFING_TIMEOUT = 15.0
+
+# (log label, agentType, fallback content) for each chat agent, in response order
+_CHAT_AGENTS = (
+    ("Trainer", "Physical Trainer", "Unable to process trainer analysis."),
+    ("Nutritionist", "Nutritionist", "Unable to process nutrition analysis."),
+    ("Wellness", "Wellness Coach", "Unable to process wellness analysis."),
+)
+
+def _chat_fallback_reply(agent_type: str) -> dict:
+    """Placeholder reply for a chat agent that failed or timed out."""
+    fallback = next(content for _, agent, content in _CHAT_AGENTS if agent == agent_type)
+    return {
+        "agentType": agent_type,
+        "content": fallback,
+        "summary": "Service temporarily unavailable."
+    }
+
+def _run_daily_briefing(user_id: str) -> dict:
+    """Import and run the manager briefing (called off the event loop)."""
+    from backend.agents.manager_agent import generate_daily_briefing
+    return generate_daily_briefing(user_id)
+
 @app.post("/api/chat")
 async def chat_handler(request: ChatRequest):
     """
@@ -586,63 +800,52 @@ async def chat_handler(request: ChatRequest):
     if not api_key or not pinecone_key:
         raise HTTPException(status_code=500, detail="Missing API Keys in environment.")
 
-    print(f"Chat request received: {request.message[:50]}...")
+    logger.info("Chat request received: %s...", request.message[:50])
     
-    # Fetch user profile for personalized responses
-    user_profile = get_user_profile(user_id=request.user_id)
+    # The manager briefing only needs the user id, so start it now and let it
+    # overlap with the profile lookup and the three agent calls below
+    briefing_task = asyncio.create_task(asyncio.to_thread(_run_daily_briefing, request.user_id))
+    
+    # Fetch user profile for personalized responses. Every agent embeds the message first
+    # (cache check + memory lookups), so embed it now alongside the profile round-trip;
+    # the agents then hit the warm embedding LRU.
+    user_profile, _ = await asyncio.gather(
+        asyncio.to_thread(get_user_profile, user_id=request.user_id),
+        asyncio.to_thread(message_vector, request.message)
+    )
     if user_profile:
-        print(f"📋 User profile loaded: {user_profile.get('calories')} cal, phase: {user_profile.get('phase')}")
+        logger.info("[INFO] User profile loaded: %s cal, phase: %s", user_profile.get('calories'), user_profile.get('phase'))
     else:
-        print("ℹ️ No user profile found, using defaults")
-    
-    # Generate responses from all agents in parallel-ish fashion
-    agent_responses = []
-    
-    # 1. Physical Trainer (AI-powered with Pinecone context + user profile)
-    try:
-        trainer_response = generate_trainer_chat_response(request.message, user_profile, user_id=request.user_id)
-        agent_responses.append(trainer_response)
-        print(f"✅ Trainer response generated")
-    except Exception as e:
-        print(f"❌ Trainer error: {e}")
-        agent_responses.append({
-            "agentType": "Physical Trainer",
-            "content": "Unable to process trainer analysis.",
-            "summary": "Service temporarily unavailable."
-        })
-    
-    # 2. Nutritionist (AI-powered with Pinecone context + user profile)
-    try:
-        nutritionist_response = generate_nutritionist_chat_response(request.message, user_profile, user_id=request.user_id)
-        agent_responses.append(nutritionist_response)
-        print(f"✅ Nutritionist response generated")
-    except Exception as e:
-        print(f"❌ Nutritionist error: {e}")
-        agent_responses.append({
-            "agentType": "Nutritionist",
-            "content": "Unable to process nutrition analysis.",
-            "summary": "Service temporarily unavailable."
-        })
+        logger.info("[INFO] No user profile found, using defaults")
     
+    # Generate responses from all agents concurrently (Groq calls plus Pinecone queries)
+    # 1. Physical Trainer + 2. Nutritionist: one combined Groq call (AI-powered with Pinecone context + user profile)
     # 3. Wellness Agent (AI-powered with biometric analysis)
-    try:
-        wellness_response = generate_wellness_chat_response(request.message, user_profile=user_profile, user_id=request.user_id)
-        agent_responses.append(wellness_response)
-        print(f"✅ Wellness response generated")
-    except Exception as e:
-        print(f"❌ Wellness error: {e}")
-        agent_responses.append({
-            "agentType": "Wellness Coach",
-            "content": "Unable to process wellness analysis.",
-            "summary": "Service temporarily unavailable."
-        })
+    # Each call gets its own deadline; a slow one falls back instead of holding the response
+    combined, wellness = await asyncio.gather(
+        asyncio.wait_for(generate_trainer_nutritionist_chat_responses(request.message, user_profile, user_id=request.user_id), CHAT_AGENT_TIMEOUT),
+        asyncio.wait_for(asyncio.to_thread(generate_wellness_chat_response, request.message, user_profile=user_profile, user_id=request.user_id), CHAT_AGENT_TIMEOUT),
+        return_exceptions=True
+    )
+    # Trainer and nutritionist share the combined call's outcome (both replies, or the same error)
+    results = (combined, combined, wellness) if isinstance(combined, Exception) else (*combined, wellness)
+    
+    agent_responses = []
+    for (label, agent_type, _), result in zip(_CHAT_AGENTS, results):
+        if isinstance(result, Exception):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning("[WARN] %s timed out after %ss", label, CHAT_AGENT_TIMEOUT)
+            else:
+                logger.error("[ERR] %s error: %s", label, result)
+            agent_responses.append(_chat_fallback_reply(agent_type))
+        else:
+            agent_responses.append(result)
+            logger.info("[OK] %s response generated", label)
     
     # 4. Manager Agent (AI-powered orchestration)
     manager_decision_text = ""
     try:
-        from backend.agents.manager_agent import generate_daily_briefing
-        
-        briefing = generate_daily_briefing(request.user_id)
+        briefing = await asyncio.wait_for(briefing_task, MANAGER_BRIEFING_TIMEOUT)
         
         # Format manager decision from briefing
         workout = briefing.get('workout_plan', {})
@@ -666,9 +869,9 @@ async def chat_handler(request: ChatRequest):
 {conflict_text}
 **Final Decision:** {final.get('summary', 'Plan synthesized based on current wellness and goals.')}"""
         
-        print(f"✅ Manager decision generated")
+        logger.info("[OK] Manager decision generated")
     except Exception as e:
-        print(f"❌ Manager error: {e}")
+        logger.error("[ERR] Manager error: %s", e)
         manager_decision_text = "Based on all agent inputs, the recommended action has been synthesized. Please review individual agent recommendations above."
     
     # Return multi-agent response
@@ -677,43 +880,286 @@ async def chat_handler(request: ChatRequest):
         "manager_decision": manager_decision_text
     }
 
+async def _stream_groq_agent(agent_type: str, cache_agent: str, build_messages, parse_reply, queue: asyncio.Queue,
+                             user_message: str, user_profile: dict, user_id: str):
+    """
+    Forward one agent's Groq tokens into the shared SSE queue as (agent, "delta", text), then mark it done.
+    The raw text is only parsed once the stream ends: the parsed reply (same shape as /api/chat)
+    is queued as a "response" event and cached. A cached reply is sent straight away without
+    calling Groq; a failure is queued as an "error" event carrying the fallback reply.
+    """
+    try:
+        query_vector = await asyncio.to_thread(message_vector, user_message)
+        cached = chat_response_cache.get(cache_agent, user_id, user_message, query_vector)
+        if cached is not None:
+            await queue.put((agent_type, "response", cached))
+            return
+        
+        messages = await build_messages(user_message, user_profile, user_id)
+        stream = await _get_async_groq_client().chat.completions.create(
+            messages=messages,
+            model="llama-3.1-8b-instant",
+            temperature=0.5,
+            max_tokens=300,
+            seed=CHAT_COMPLETION_SEED,
+            stream=True,
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                await queue.put((agent_type, "delta", delta))
+        
+        reply = parse_reply("".join(parts))
+        chat_response_cache.put(cache_agent, user_id, user_message, query_vector, reply)
+        await queue.put((agent_type, "response", reply))
+    except Exception as e:
+        logger.error("[ERR] %s stream error: %s", agent_type, e)
+        await queue.put((agent_type, "error", _chat_fallback_reply(agent_type)))
+    finally:
+        await queue.put((agent_type, "done", None))
+
+def _stream_wellness_agent(loop, queue: asyncio.Queue, user_message: str, user_profile: dict, user_id: str):
+    """Forward the wellness coach's streamed events (sync Groq generator) into the SSE queue from a worker thread."""
+    try:
+        for kind, payload in generate_wellness_chat_response_stream(user_message, user_profile=user_profile, user_id=user_id):
+            loop.call_soon_threadsafe(queue.put_nowait, ("Wellness Coach", kind, payload))
+    except Exception as e:
+        logger.error("[ERR] Wellness Coach stream error: %s", e)
+        loop.call_soon_threadsafe(queue.put_nowait, ("Wellness Coach", "error", _chat_fallback_reply("Wellness Coach")))
+    finally:
+        loop.call_soon_threadsafe(queue.put_nowait, ("Wellness Coach", "done", None))
+
+@app.get("/api/chat/stream")
+async def chat_stream_handler(message: str, user_id: str):
+    """
+    Streaming variant of /api/chat (Server-Sent Events).
+    Emits {"agent", "delta"} events as each agent's tokens arrive, interleaved across agents,
+    then one {"agent", "response"} event per agent with its reply parsed like /api/chat, or an
+    {"agent", "error": true, "response"} event with a fallback reply if that agent failed
+    (its earlier deltas should be discarded). Ends with a {"done": true} event.
+    The manager briefing is not part of the stream.
+    """
+    api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    if not api_key or not os.environ.get("PINECONE_API_KEY"):
+        raise HTTPException(status_code=500, detail="Missing API Keys in environment.")
+    
+    async def events():
+        # Profile round-trip overlaps the message embedding every agent starts with
+        user_profile, _ = await asyncio.gather(
+            asyncio.to_thread(get_user_profile, user_id=user_id),
+            asyncio.to_thread(message_vector, message)
+        )
+        queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        producers = [
+            asyncio.create_task(_stream_groq_agent("Physical Trainer", "trainer", _build_trainer_chat_messages, _trainer_chat_reply,
+                                                    queue, message, user_profile, user_id)),
+            asyncio.create_task(_stream_groq_agent("Nutritionist", "nutritionist", _build_nutritionist_chat_messages, _nutritionist_chat_reply,
+                                                    queue, message, user_profile, user_id)),
+            asyncio.create_task(asyncio.to_thread(_stream_wellness_agent, loop, queue, message, user_profile, user_id)),
+        ]
+        
+        remaining = len(producers)
+        while remaining:
+            agent_type, kind, payload = await queue.get()
+            if kind == "done":
+                remaining -= 1
+            elif kind == "delta":
+                yield b"data: " + orjson.dumps({"agent": agent_type, "delta": payload}) + b"\n\n"
+            elif kind == "response":
+                yield b"data: " + orjson.dumps({"agent": agent_type, "response": payload}) + b"\n\n"
+            else:
+                yield b"data: " + orjson.dumps({"agent": agent_type, "error": True, "response": payload}) + b"\n\n"
+        
+        await asyncio.gather(*producers, return_exceptions=True)
+        yield b"data: " + orjson.dumps({"done": True}) + b"\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+# Short-lived cache for profile/wellness lookups so bursts of requests share one Pinecone query.
+# On disk so every worker sees the invalidation done by the save endpoints.
+_user_data_cache = Cache(
+    os.environ.get("USER_DATA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "triad_user_data")),
+    size_limit=int(1e7)
+)
+USER_DATA_CACHE_TTL = 60
+
+# Background memory writer: endpoints queue their Pinecone saves and return immediately;
+# one task drains the queue and writes up to MEMORY_BATCH_SIZE entries (or whatever arrived
+# within MEMORY_FLUSH_INTERVAL seconds) with a single embed call and one upsert per namespace.
+# Entries whose write fails are re-queued after MEMORY_RETRY_DELAY seconds, up to
+# MEMORY_WRITE_ATTEMPTS writes in total, before being logged as dropped.
+MEMORY_BATCH_SIZE = 32
+MEMORY_FLUSH_INTERVAL = 0.2
+MEMORY_WRITE_ATTEMPTS = 3
+MEMORY_RETRY_DELAY = 2.0
+_memory_queue = None
+_memory_writer_task = None
+
+def queue_agent_memory(entry: dict, cache_tag: str = None):
+    """Queue a save_agent_memory-style entry for the background writer (falls back to a direct save)."""
+    if _memory_queue is None:
+        save_agent_memory(**entry)
+        if cache_tag:
+            _user_data_cache.evict(cache_tag)
+        return
+    _memory_queue.put_nowait((entry, cache_tag, 1))
+
+def _flush_memory_batch(batch: list) -> list:
+    """Write one batch of queued entries, drop the cached lookups they affect, and return the failed items."""
+    log_ids = save_agent_memories_batch([entry for entry, _, _ in batch])
+    written = [item for item, log_id in zip(batch, log_ids) if log_id is not None]
+    failed = [item for item, log_id in zip(batch, log_ids) if log_id is None]
+    
+    for tag in {tag for _, tag, _ in written if tag}:
+        _user_data_cache.evict(tag)
+    for user_id in {entry.get("user_id") for entry, _, _ in written}:
+        chat_response_cache.clear_user(user_id)
+    if written:
+        logger.info("[OK] Flushed %s queued memories: %s", len(written), [log_id for log_id in log_ids if log_id])
+    return failed
+
+def _drop_failed_memories(items: list):
+    """Log entries that could not be written (out of retries, or failed during shutdown)."""
+    for entry, _, attempts in items:
+        logger.error("[ERR] Dropping %s memory for user %s after %s failed writes",
+                     entry.get("agent_type"), entry.get("user_id"), attempts)
+
+async def _memory_writer():
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _memory_queue.get()]
+        deadline = loop.time() + MEMORY_FLUSH_INTERVAL
+        try:
+            while len(batch) < MEMORY_BATCH_SIZE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_memory_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+        except asyncio.CancelledError:
+            # Shutting down mid-collection: hand the entries back so the shutdown drain writes them
+            for item in batch:
+                _memory_queue.put_nowait(item)
+            raise
+        
+        try:
+            failed = await asyncio.to_thread(_flush_memory_batch, batch)
+        except Exception as e:
+            logger.error("[ERR] Memory batch write failed: %s", e)
+            failed = batch
+        if not failed:
+            continue
+        
+        retry = [(entry, tag, attempts + 1) for entry, tag, attempts in failed if attempts < MEMORY_WRITE_ATTEMPTS]
+        _drop_failed_memories([item for item in failed if item[2] >= MEMORY_WRITE_ATTEMPTS])
+        if retry:
+            logger.warning("[WARN] %s memories failed to save, retrying in %ss", len(retry), MEMORY_RETRY_DELAY)
+            for item in retry:
+                _memory_queue.put_nowait(item)
+            await asyncio.sleep(MEMORY_RETRY_DELAY)
+
+@app.on_event("startup")
+async def _start_memory_writer():
+    global _memory_queue, _memory_writer_task
+    _memory_queue = asyncio.Queue()
+    _memory_writer_task = asyncio.create_task(_memory_writer())
+
+@app.on_event("shutdown")
+async def _stop_memory_writer():
+    # Stop the writer first (it hands back a half-collected batch), so the drain below can't race it
+    _memory_writer_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await _memory_writer_task
+    
+    # Write whatever is still queued before the process exits (one attempt, off the event loop)
+    batch = []
+    while not _memory_queue.empty():
+        batch.append(_memory_queue.get_nowait())
+    if batch:
+        try:
+            failed = await asyncio.to_thread(_flush_memory_batch, batch)
+        except Exception as e:
+            logger.error("[ERR] Memory batch write failed: %s", e)
+            failed = batch
+        _drop_failed_memories(failed)
+
 def get_user_profile(user_id: str = None) -> dict:
+    """Fetch the latest user profile (cached for USER_DATA_CACHE_TTL seconds)."""
+    cache_key = ("profile", user_id)
+    profile = _user_data_cache.get(cache_key)
+    if profile is None:
+        profile = _fetch_user_profile(user_id)
+        # Misses and errors are not cached, so a fresh profile shows up as soon as it exists
+        if profile is not None:
+            _user_data_cache.set(cache_key, profile, expire=USER_DATA_CACHE_TTL, tag="profile")
+    return profile
+
+def _fetch_user_profile(user_id: str = None) -> dict:
     """Fetch the latest user profile from Pinecone."""
     try:
-        from backend.tools.memory_store import _get_index, get_profile_query_vector
-        
         index = _get_index()
         
-        # Use cached query vector (avoids embedding API call)
+        # Use cached query vector (avoids embedding API call). The metadata filter does the
+        # actual selection, so the vector only ranks profile records against each other.
         query_vector = get_profile_query_vector()
         
         results = index.query(
             vector=query_vector,
-            top_k=5,
+            top_k=1,
             include_metadata=True,
+            filter={"type": "user_profile"},
             namespace=user_id
         )
         
-        # Find user_profile type
-        for match in results.get('matches', []):
-            meta = match.get('metadata', {})
-            if meta.get('type') == 'user_profile':
-                return {
-                    "calories": meta.get('calories', 2000),
-                    "phase": meta.get('phase', 'maintenance'),
-                    "protein_target": meta.get('protein_target', 150),
-                    "notes": meta.get('notes', '')
-                }
+        # Every match is a user_profile record; take the best-ranked one
+        matches = results.get('matches', [])
+        if not matches:
+            return None
         
-        return None
+        meta = matches[0].get('metadata') or {}
+        return {
+            "calories": meta.get('calories', 2000),
+            "phase": meta.get('phase', 'maintenance'),
+            "protein_target": meta.get('protein_target', 150),
+            "notes": meta.get('notes', '')
+        }
     except Exception as e:
-        print(f"Error fetching user profile: {e}")
+        logger.error("Error fetching user profile: %s", e)
         return None
+
+# Wellness metric -> category thresholds for np.searchsorted (also takes arrays of values).
+# side="right" puts a value equal to a bin edge in the upper category (HRV >= 65 is High,
+# readiness >= 80 is Good); RHR uses side="left" so an edge stays in the lower one (RHR <= 58 is Low).
+HRV_BINS = np.array([45, 65])
+HRV_LABELS = ("Low", "Normal", "High")
+RHR_STRESS_BINS = np.array([58, 68])
+RHR_STRESS_LABELS = ("Low", "Moderate", "High")
+READINESS_BINS = np.array([60, 80])
+READINESS_LABELS = ("Compromised", "Moderate", "Good")
+
+# Wellness values used when a user has no logs yet or the lookup fails
+_DEFAULT_WELLNESS_DATA = {"sleep_score": 70, "stress_level": "Moderate", "hrv": "Normal", "readiness": "Good"}
+
 def get_wellness_data(user_id: str = None) -> dict:
-    """Fetch the latest wellness data from Pinecone (stored by wellness agent)."""
+    """Fetch the latest wellness data (cached for USER_DATA_CACHE_TTL seconds)."""
+    cache_key = ("wellness", user_id)
+    wellness_data = _user_data_cache.get(cache_key)
+    if wellness_data is None:
+        wellness_data = _fetch_wellness_data(user_id)
+        # Defaults (no logs yet) and errors are not cached, so a fresh log shows up as soon as it exists
+        if wellness_data is None:
+            return dict(_DEFAULT_WELLNESS_DATA)
+        _user_data_cache.set(cache_key, wellness_data, expire=USER_DATA_CACHE_TTL, tag="wellness")
+    return wellness_data
+
+def _fetch_wellness_data(user_id: str = None) -> dict:
+    """Fetch the latest wellness data from Pinecone (stored by wellness agent), or None if there is none."""
     try:
-        from backend.tools.memory_store import get_wellness_memory
-        
         # Use the proper wellness memory retrieval function
         if not user_id:
             # Fallback for when current user is unknown (should be rare)
@@ -722,12 +1168,7 @@ def get_wellness_data(user_id: str = None) -> dict:
         wellness_logs = get_wellness_memory(query="recent wellness readiness", top_k=1, user_id=user_id)
         
         # Default values
-        wellness_data = {
-            "sleep_score": 70,
-            "stress_level": "Moderate",
-            "hrv": "Normal",
-            "readiness": "Good"
-        }
+        wellness_data = dict(_DEFAULT_WELLNESS_DATA)
         
         if wellness_logs and len(wellness_logs) > 0:
             latest = wellness_logs[0]
@@ -738,97 +1179,104 @@ def get_wellness_data(user_id: str = None) -> dict:
             
             # Convert HRV to category
             hrv_value = latest.get('hrv', 50)
-            if hrv_value >= 65:
-                wellness_data["hrv"] = "High"
-            elif hrv_value >= 45:
-                wellness_data["hrv"] = "Normal"
-            else:
-                wellness_data["hrv"] = "Low"
+            wellness_data["hrv"] = HRV_LABELS[int(np.searchsorted(HRV_BINS, hrv_value, side="right"))]
             
             # Convert RHR to stress level (inverse relationship)
             rhr_value = latest.get('rhr', 65)
-            if rhr_value <= 58:
-                wellness_data["stress_level"] = "Low"
-            elif rhr_value <= 68:
-                wellness_data["stress_level"] = "Moderate"
-            else:
-                wellness_data["stress_level"] = "High"
+            wellness_data["stress_level"] = RHR_STRESS_LABELS[int(np.searchsorted(RHR_STRESS_BINS, rhr_value, side="left"))]
             
             # Convert readiness score to category
             readiness_score = latest.get('readiness_score', 70)
-            if readiness_score >= 80:
-                wellness_data["readiness"] = "Good"
-            elif readiness_score >= 60:
-                wellness_data["readiness"] = "Moderate"
-            else:
-                wellness_data["readiness"] = "Compromised"
+            wellness_data["readiness"] = READINESS_LABELS[int(np.searchsorted(READINESS_BINS, readiness_score, side="right"))]
             
-            print(f"📊 Fetched wellness data from latest log:")
-            print(f"   Sleep: {sleep_hours}h (score: {wellness_data['sleep_score']})")
-            print(f"   HRV: {hrv_value}ms ({wellness_data['hrv']})")
-            print(f"   RHR: {rhr_value}bpm (stress: {wellness_data['stress_level']})")
-            print(f"   Readiness: {readiness_score}/100 ({wellness_data['readiness']})")
+            logger.info("[INFO] Fetched wellness data from latest log:")
+            logger.info("   Sleep: %sh (score: %s)", sleep_hours, wellness_data['sleep_score'])
+            logger.info("   HRV: %sms (%s)", hrv_value, wellness_data['hrv'])
+            logger.info("   RHR: %sbpm (stress: %s)", rhr_value, wellness_data['stress_level'])
+            logger.info("   Readiness: %s/100 (%s)", readiness_score, wellness_data['readiness'])
         else:
-            print(f"⚠️ No wellness logs found, using defaults: {wellness_data}")
+            logger.warning("[WARN] No wellness logs found, using defaults: %s", wellness_data)
+            return None
         
         return wellness_data
         
     except Exception as e:
-        print(f"❌ Error fetching wellness data: {e}")
-        return {"sleep_score": 70, "stress_level": "Moderate", "hrv": "Normal", "readiness": "Good"}
+        logger.error("[ERR] Error fetching wellness data: %s", e)
+        return None
+
 
+# Injury keywords looked for in wellness log summaries/text
+_INJURY_RE = re.compile(r"injury|pain", re.IGNORECASE)
+
+# Runs the exercise-history lookup alongside the wellness one in detect_injury_from_history
+_HISTORY_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="history")
+atexit.register(_HISTORY_POOL.shutdown, wait=False)
 
 def detect_injury_from_history(user_id: str = None) -> bool:
     """
     Detect if user has an injury based on wellness and exercise history.
+    The verdict is cached for USER_DATA_CACHE_TTL seconds (dropped on wellness saves), so the
+    weekly-plan validity check and plan regeneration share one pair of Pinecone lookups.
     """
+    cache_key = ("injury", user_id)
+    injured = _user_data_cache.get(cache_key)
+    if injured is not None:
+        return injured
+    
     try:
-        from backend.tools.memory_store import get_wellness_memory, get_exercise_memory
-        
-        # Check wellness data for low readiness
-        wellness_logs = get_wellness_memory(query="recent wellness readiness", top_k=5, user_id=user_id)
-        low_readiness_count = 0
-        
-        for log in wellness_logs:
-            readiness = log.get('readiness_score', 100)
-            if readiness < 40:
-                low_readiness_count += 1
-            
-            # Check for injury keywords in summary
-            summary = log.get('executive_summary', '').lower()
-            text = log.get('text', '').lower()
-            if 'injury' in summary or 'injury' in text or 'pain' in summary or 'pain' in text:
-                print(f"🚨 Injury keyword detected in wellness log")
-                return True
-        
-        if low_readiness_count >= 3:
-            print(f"🚨 Critical fatigue detected: {low_readiness_count} low readiness scores")
-            return True
-        
-        # Check exercise data for form issues
-        exercise_logs = get_exercise_memory(query="recent workout form", top_k=5, user_id=user_id)
-        poor_form_count = 0
-        
-        for log in exercise_logs:
-            rating = log.get('rating', 10)
-            issues = log.get('issues', [])
-            
-            if rating < 5 and len(issues) > 0:
-                poor_form_count += 1
-        
-        if poor_form_count >= 3:
-            print(f"⚠️ Recurring form issues detected: {poor_form_count} poor ratings")
-            return True
-        
-        print(f"✅ No injuries detected")
-        return False
-        
+        injured = _detect_injury_from_history(user_id)
     except Exception as e:
-        print(f"❌ Error detecting injury: {e}")
+        logger.error("[ERR] Error detecting injury: %s", e)
         return False
+    
+    _user_data_cache.set(cache_key, injured, expire=USER_DATA_CACHE_TTL, tag="wellness")
+    return injured
 
+def _detect_injury_from_history(user_id: str = None) -> bool:
+    """Query wellness and exercise history from Pinecone and apply the injury rules."""
+    # Exercise logs are fetched in the background while the wellness logs are checked
+    exercise_future = _HISTORY_POOL.submit(get_exercise_memory, query="recent workout form", top_k=5, user_id=user_id)
+    
+    # Check wellness data for low readiness
+    wellness_logs = get_wellness_memory(query="recent wellness readiness", top_k=5, user_id=user_id)
+    low_readiness_count = 0
+    
+    for log in wellness_logs:
+        readiness = log.get('readiness_score', 100)
+        if readiness < 40:
+            low_readiness_count += 1
+        
+        # Check for injury keywords in summary (one case-insensitive scan per field, no lowercased copies)
+        if _INJURY_RE.search(log.get('executive_summary', '')) or _INJURY_RE.search(log.get('text', '')):
+            logger.warning("[ALERT] Injury keyword detected in wellness log")
+            exercise_future.cancel()
+            return True
+    
+    if low_readiness_count >= 3:
+        logger.warning("[ALERT] Critical fatigue detected: %s low readiness scores", low_readiness_count)
+        exercise_future.cancel()
+        return True
+    
+    # Check exercise data for form issues
+    exercise_logs = exercise_future.result()
+    poor_form_count = 0
+    
+    for log in exercise_logs:
+        rating = log.get('rating', 10)
+        issues = log.get('issues', [])
+        
+        if rating < 5 and len(issues) > 0:
+            poor_form_count += 1
+    
+    if poor_form_count >= 3:
+        logger.warning("[WARN] Recurring form issues detected: %s poor ratings", poor_form_count)
+        return True
+    
+    logger.info("[OK] No injuries detected")
+    return False
 
-def is_plan_valid(plan_metadata: dict) -> bool:
+
+def is_plan_valid(plan_metadata: dict, user_id: str = None) -> bool:
     """
     Check if a cached training plan is still valid.
     """
@@ -836,9 +1284,6 @@ def is_plan_valid(plan_metadata: dict) -> bool:
         return False
     
     try:
-        import time
-        from datetime import datetime, timedelta
-        
         created_timestamp = plan_metadata.get('created_timestamp', 0)
         current_timestamp = int(time.time())
         
@@ -848,19 +1293,19 @@ def is_plan_valid(plan_metadata: dict) -> bool:
         
         # Check if plan is older than 5 weeks (35 days)
         if age_days > 35:
-            print(f"📅 Plan expired: {age_days:.1f} days old (>35 days)")
+            logger.info("[INFO] Plan expired: %.1f days old (>35 days)", age_days)
             return False
         
         # Check for injuries
-        if detect_injury_from_history():
-            print(f"🚨 Plan invalid: Injury detected")
+        if detect_injury_from_history(user_id):
+            logger.warning("[ALERT] Plan invalid: Injury detected")
             return False
         
-        print(f"✅ Plan valid: {age_days:.1f} days old, no injuries")
+        logger.info("[OK] Plan valid: %.1f days old, no injuries", age_days)
         return True
         
     except Exception as e:
-        print(f"❌ Error validating plan: {e}")
+        logger.error("[ERR] Error validating plan: %s", e)
         return False
 
 
@@ -869,7 +1314,7 @@ def generate_weekly_training_plan(user_profile: dict = None, wellness_data: dict
     Generate a new weekly training plan using AI (Groq).
     """
     try:
-        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        client = _get_groq_client()
         
         # Build context from user data
         profile_context = ""
@@ -1053,13 +1498,13 @@ Now create the program in valid JSON format."""
         plan_data = extract_json(result)
         
         if plan_data:
-            print(f"✅ Generated new weekly plan with {len(plan_data.get('weekly_schedule', []))} days")
+            logger.info("[OK] Generated new weekly plan with %s days", len(plan_data.get('weekly_schedule', [])))
             return plan_data
         else:
             raise ValueError("Failed to parse plan JSON")
             
     except Exception as e:
-        print(f"❌ Error generating plan: {e}")
+        logger.error("[ERR] Error generating plan: %s", e)
         # Improve fallback plan
         return {
             "weekly_schedule": [{"day": "Monday", "focus": "Complete body", "exercises": []}],
@@ -1072,7 +1517,6 @@ def adjust_plan_volume(plan: dict, wellness_data: dict = None, nutrition_data: d
     Adjust sets/reps in an existing plan based on current wellness and nutrition.
     """
     try:
-        import copy
         adjusted_plan = copy.deepcopy(plan)
         adjustment_reason = "Volume maintained"
         
@@ -1105,19 +1549,17 @@ def adjust_plan_volume(plan: dict, wellness_data: dict = None, nutrition_data: d
                         original_sets = exercise.get('sets', 3)
                         exercise['sets'] = max(1, round(original_sets * volume_multiplier))
         
-        print(f"📊 Volume adjusted: {volume_multiplier}x - {adjustment_reason}")
+        logger.info("[INFO] Volume adjusted: %sx - %s", volume_multiplier, adjustment_reason)
         return adjusted_plan, adjustment_reason
         
     except Exception as e:
-        print(f"❌ Error adjusting volume: {e}")
+        logger.error("[ERR] Error adjusting volume: %s", e)
         return plan, "No adjustments applied (error)"
 
 @app.post("/api/profile/save")
 async def save_user_profile(request: UserProfileRequest):
     """Save user's fitness profile (calories, cutting/bulking) to Pinecone."""
     try:
-        from backend.tools.memory_store import save_agent_memory
-        
         profile_text = f"User profile: {request.calories} calories/day, phase: {request.phase}, protein target: {request.protein_target}g. Notes: {request.notes}"
         
         log_id = save_agent_memory(
@@ -1131,6 +1573,8 @@ async def save_user_profile(request: UserProfileRequest):
                 "notes": request.notes
             }
         )
+        _user_data_cache.evict("profile")  # Drop cached profile lookups so the next read sees this save
+        chat_response_cache.clear_user(request.user_id)  # Cached chat answers were tailored to the old profile
         
         return {
             "status": "success",
@@ -1155,11 +1599,8 @@ async def get_dashboard_metrics(user_id: str):
     Fetch dashboard metrics from Pinecone (parallelized for performance).
     Returns wellness data, user profile, and recent agent activity logs.
     """
-    import asyncio
     
     try:
-        from backend.tools.memory_store import get_wellness_memory, get_exercise_memory, get_nutrition_memory
-        
         # Parallelize all Pinecone queries using asyncio.to_thread
         wellness_task = asyncio.to_thread(get_wellness_memory, query="recent wellness readiness biometrics", top_k=1, user_id=user_id)
         profile_task = asyncio.to_thread(get_user_profile, user_id=user_id)
@@ -1242,7 +1683,7 @@ async def get_dashboard_metrics(user_id: str):
         }
         
     except Exception as e:
-        print(f"❌ Error fetching dashboard metrics: {e}")
+        logger.error("[ERR] Error fetching dashboard metrics: %s", e)
         return {
             "status": "error",
             "message": str(e),
@@ -1258,10 +1699,7 @@ async def save_wellness_data(request: WellnessRequest):
     Useful for manual data entry/simulation.
     """
     try:
-        from backend.tools.memory_store import save_agent_memory
-        import time
-        
-        print(f"💾 Saving wellness data: Sleep={request.sleep_hours}h, HRV={request.hrv}, RHR={request.rhr}")
+        logger.info("[INFO] Saving wellness data: Sleep=%sh, HRV=%s, RHR=%s", request.sleep_hours, request.hrv, request.rhr)
         
         # Simple readiness calculation (mock logic corresponding to frontend)
         readiness_score = 70
@@ -1281,7 +1719,10 @@ async def save_wellness_data(request: WellnessRequest):
         - Estimated Readiness: {readiness_score}/100
         """
         
-        log_id = save_agent_memory(
+        # Saved synchronously: the frontend reports "saved" and refreshes the dashboard
+        # as soon as this returns, so the write must have landed (no background queue here)
+        log_id = await asyncio.to_thread(
+            save_agent_memory,
             agent_type="wellness",
             content=text_content,
             metadata={
@@ -1295,8 +1736,13 @@ async def save_wellness_data(request: WellnessRequest):
             },
             user_id=request.user_id
         )
+        if log_id is None:
+            raise HTTPException(status_code=500, detail="Failed to save wellness data to Pinecone")
+        
+        _user_data_cache.evict("wellness")  # Drop cached wellness lookups so the next read sees this save
+        chat_response_cache.clear_user(request.user_id)  # Cached chat answers predate this log
         
-        print(f"✅ Wellness data saved: {log_id}")
+        logger.info("[OK] Wellness data saved: %s", log_id)
         
         return {
             "status": "success",
@@ -1304,8 +1750,10 @@ async def save_wellness_data(request: WellnessRequest):
             "readiness_score": readiness_score
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Wellness save error: {e}")
+        logger.error("[ERR] Wellness save error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/wellness/upload")
@@ -1316,17 +1764,14 @@ async def upload_wellness_data(request: dict):
     Saves the *latest* record to Pinecone as current status.
     """
     try:
-        from backend.tools.memory_store import save_agent_memory
-        import time
-
         data = request.get('data', [])
         user_id = request.get('user_id')
-        print(f"DEBUG: Upload endpoint hit for {user_id}")
+        logger.debug("DEBUG: Upload endpoint hit for %s", user_id)
         
         if not data or not isinstance(data, list):
             raise HTTPException(status_code=400, detail="Invalid data format. Expected list of daily records.")
 
-        print(f"📂 Received {len(data)} days of wearable data for {user_id}")
+        logger.info("[INFO] Received %s days of wearable data for %s", len(data), user_id)
         
         # 1. Sort by date just in case
         # Assuming date format YYYY-MM-DD
@@ -1411,7 +1856,9 @@ async def upload_wellness_data(request: dict):
             },
             user_id=user_id
         )
-        print(f"DEBUG: Check 10 - Memory Saved")
+        _user_data_cache.evict("wellness")  # Drop cached wellness lookups so the next read sees this save
+        chat_response_cache.clear_user(user_id)  # Cached chat answers predate this log
+        logger.debug("DEBUG: Check 10 - Memory Saved")
 
         return {
             "status": "success",
@@ -1421,20 +1868,19 @@ async def upload_wellness_data(request: dict):
         }
 
     except Exception as e:
-        print(f"❌ Upload error: {e}")
+        logger.error("[ERR] Upload error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/wellness/analyze")
 async def analyze_wellness_data(request: WellnessRequest):
     """
     Analyze biometric data (sleep, HRV, RHR) using Gemini-powered wellness brain.
-    Saves analysis to Pinecone for cross-agent memory sharing.
+    Saves analysis to Pinecone for cross-agent memory sharing. The save is queued for the
+    background memory writer, so the response carries save_status "queued" and no log_id;
+    the analysis itself is returned immediately. Failed writes are retried by the writer
+    (MEMORY_WRITE_ATTEMPTS in total) and logged if they still fail.
     """
     try:
-        from backend.agents.wellness.brain import analyze_wellness
-        from backend.tools.memory_store import save_agent_memory
-        import time
-        
         # Prepare data dict for analysis
         wellness_data = {
             "sleep_hours": request.sleep_hours,
@@ -1442,7 +1888,7 @@ async def analyze_wellness_data(request: WellnessRequest):
             "rhr": request.rhr
         }
         
-        print(f"🧠 Analyzing wellness data: Sleep={request.sleep_hours}h, HRV={request.hrv}, RHR={request.rhr}")
+        logger.info("[INFO] Analyzing wellness data: Sleep=%sh, HRV=%s, RHR=%s", request.sleep_hours, request.hrv, request.rhr)
         
         # Run analysis using wellness brain
         analysis = analyze_wellness(wellness_data)
@@ -1458,31 +1904,36 @@ async def analyze_wellness_data(request: WellnessRequest):
         Nutritional Strategy: {analysis.get('nutritional_strategy')}
         """
         
-        log_id = save_agent_memory(
-            agent_type="wellness",
-            content=text_content,
-            metadata={
-                "type": "wellness",
-                "user_id": request.user_id,
-                "sleep_hours": request.sleep_hours,
-                "hrv": request.hrv,
-                "rhr": request.rhr,
-                "readiness_score": analysis.get('readiness_score', 0),
-                "executive_summary": analysis.get('executive_summary', '')[:500]
+        # Written by the background memory writer (batched with other saves)
+        queue_agent_memory(
+            {
+                "agent_type": "wellness",
+                "content": text_content,
+                "metadata": {
+                    "type": "wellness",
+                    "user_id": request.user_id,
+                    "sleep_hours": request.sleep_hours,
+                    "hrv": request.hrv,
+                    "rhr": request.rhr,
+                    "readiness_score": analysis.get('readiness_score', 0),
+                    "executive_summary": analysis.get('executive_summary', '')[:500]
+                },
+                "user_id": request.user_id  # Pass user_id for correct namespace
             },
-            user_id=request.user_id  # Pass user_id for correct namespace
+            cache_tag="wellness"
         )
         
-        print(f"✅ Wellness analysis saved: {log_id}")
+        logger.info("[OK] Wellness analysis queued for saving")
         
         return {
             "status": "success",
-            "log_id": log_id,
+            "log_id": None,
+            "save_status": "queued",
             "analysis": analysis
         }
         
     except Exception as e:
-        print(f"❌ Wellness analysis error: {e}")
+        logger.error("[ERR] Wellness analysis error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1493,9 +1944,7 @@ async def get_wellness_data_endpoint(user_id: str = None):
     Used to persist wellness slider values across component navigation.
     """
     try:
-        from backend.tools.memory_store import get_wellness_memory
-        
-        print(f"📊 Fetching wellness data for user: {user_id}")
+        logger.info("[INFO] Fetching wellness data for user: %s", user_id)
         
         # Use the wellness memory retrieval function
         wellness_logs = get_wellness_memory(
@@ -1516,7 +1965,7 @@ async def get_wellness_data_endpoint(user_id: str = None):
         
         if wellness_logs and len(wellness_logs) > 0:
             latest = wellness_logs[0]
-            print(f"✅ Found wellness data: Sleep={latest.get('sleep_hours')}h, HRV={latest.get('hrv')}, RHR={latest.get('rhr')}")
+            logger.info("[OK] Found wellness data: Sleep=%sh, HRV=%s, RHR=%s", latest.get('sleep_hours'), latest.get('hrv'), latest.get('rhr'))
             return {
                 "status": "success",
                 "data": {
@@ -1529,14 +1978,14 @@ async def get_wellness_data_endpoint(user_id: str = None):
                 }
             }
         else:
-            print(f"⚠️ No wellness data found for user, returning defaults")
+            logger.warning("[WARN] No wellness data found for user, returning defaults")
             return {
                 "status": "success",
                 "data": default_data
             }
             
     except Exception as e:
-        print(f"❌ Error fetching wellness data: {e}")
+        logger.error("[ERR] Error fetching wellness data: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -1555,11 +2004,7 @@ async def get_weekly_training_plan(request: WeeklyPlanRequest):
     4. If force_regenerate is True, skip cache and generate new plan
     """
     try:
-        from backend.tools.memory_store import get_training_plan_memory, save_training_plan
-        import time
-        from datetime import datetime, timedelta
-        
-        print(f"🏋️ Weekly plan request for user {request.user_id}, force_regenerate={request.force_regenerate}")
+        logger.info("[INFO] Weekly plan request for user %s, force_regenerate=%s", request.user_id, request.force_regenerate)
         
         # Fetch user profile and wellness data for context
         user_profile = get_user_profile(user_id=request.user_id)
@@ -1573,12 +2018,12 @@ async def get_weekly_training_plan(request: WeeklyPlanRequest):
         
         if cached_plan and not request.force_regenerate:
             # Validate cache
-            if is_plan_valid(cached_plan):
+            if is_plan_valid(cached_plan, request.user_id):
                 should_use_cache = True
                 plan_status = "cached"
-                print(f"✅ Using cached plan from {cached_plan.get('created_date')}")
+                logger.info("[OK] Using cached plan from %s", cached_plan.get('created_date'))
             else:
-                print(f"⚠️ Cached plan invalid, generating new plan")
+                logger.warning("[WARN] Cached plan invalid, generating new plan")
         
         # Generate or retrieve plan
         if should_use_cache:
@@ -1616,12 +2061,12 @@ async def get_weekly_training_plan(request: WeeklyPlanRequest):
                 }
                 
             except Exception as e:
-                print(f"❌ Error using cached plan: {e}, generating new")
+                logger.error("[ERR] Error using cached plan: %s, generating new", e)
                 should_use_cache = False
         
         # Generate new plan
         if not should_use_cache:
-            print(f"🤖 Generating new weekly plan using AI...")
+            logger.info("[INFO] Generating new weekly plan using AI...")
             
             # Check if injury was detected (for metadata)
             injury_detected = detect_injury_from_history(request.user_id)
@@ -1667,10 +2112,41 @@ async def get_weekly_training_plan(request: WeeklyPlanRequest):
             }
         
     except Exception as e:
-        print(f"❌ Weekly plan error: {e}")
+        logger.error("[ERR] Weekly plan error: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to generate weekly plan: {str(e)}")
 
 
+_nutritionist_agent = None
+
+def get_nutritionist_agent():
+    """
+    Build the Nutritionist agent once per process (singleton pattern).
+    An agent whose meal data failed to load is returned but not kept, so the next request retries the load.
+    """
+    global _nutritionist_agent
+    if _nutritionist_agent is not None:
+        return _nutritionist_agent
+    
+    from backend.agents.nutritionist.agent import NutritionistAgent
+    from backend.agents.nutritionist.data_loader import FoodDataLoader
+    from backend.agents.nutritionist.retrieval import DietRetriever
+    
+    # Initialize data loader and retriever with CORRECT PATHS (backend/data)
+    data_dir = os.path.join(os.path.dirname(__file__), "data")
+    csv_path = os.path.join(data_dir, "Indian_Food_Nutrition_Processed.csv")
+    json_path = os.path.join(data_dir, "indian_gym_friendly_nutrition_rag_dataset_TOP_NOTCH_v5.1.json")
+    
+    # Load Data
+    data_loader = FoodDataLoader(csv_path, json_path)
+    retriever = DietRetriever(data_loader.get_data(), data_loader.indexes)
+    
+    # Initialize Agent
+    agent = NutritionistAgent(data_loader, retriever)
+    if not data_loader.get_data().empty:
+        _nutritionist_agent = agent
+    return agent
+
+
 @app.post("/api/nutrition/start")
 async def start_nutrition_session(request: NutritionRequest):
     goal = request.goal
@@ -1684,19 +2160,10 @@ async def start_nutrition_session(request: NutritionRequest):
         raise HTTPException(status_code=500, detail="GROQ_API_KEY not found.")
 
     try:
-        print(f"Starting Nutritionist Agent (Groq) for goal: {goal}, diet: {diet_type}, budget: {budget}...")
-        
-        # Initialize data loader and retriever with CORRECT PATHS (backend/data)
-        data_dir = os.path.join(os.path.dirname(__file__), "data")
-        csv_path = os.path.join(data_dir, "Indian_Food_Nutrition_Processed.csv")
-        json_path = os.path.join(data_dir, "indian_gym_friendly_nutrition_rag_dataset_TOP_NOTCH_v5.1.json")
+        logger.info("Starting Nutritionist Agent (Groq) for goal: %s, diet: %s, budget: %s...", goal, diet_type, budget)
         
-        # Load Data
-        data_loader = FoodDataLoader(csv_path, json_path)
-        retriever = DietRetriever(data_loader.get_data())
-        
-        # Initialize Agent
-        nutri_agent = NutritionistAgent(data_loader, retriever)
+        # Reuse the process-wide agent (keeps loaded data and its retrieval cache warm)
+        nutri_agent = get_nutritionist_agent()
 
         # Build user profile for the agent
         user_profile = {
@@ -1715,7 +2182,7 @@ async def start_nutrition_session(request: NutritionRequest):
         }
 
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/timeline")
@@ -1724,11 +2191,13 @@ async def get_timeline():
     Fetch consolidated timeline logs from all agents via Pinecone memory.
     """
     try:
-        from backend.tools.memory_store import get_exercise_memory, get_nutrition_memory, get_wellness_memory
-        # Fetch recent logs from each agent category
-        trainer_logs = get_exercise_memory(query="", top_k=5)
-        nutrition_logs = get_nutrition_memory(query="", top_k=5)
-        wellness_logs = get_wellness_memory(query="", top_k=5)
+        # Fetch recent logs from each agent category concurrently (independent Pinecone queries;
+        # the shared empty query is embedded once and then served from the embedding cache)
+        trainer_logs, nutrition_logs, wellness_logs = await asyncio.gather(
+            asyncio.to_thread(get_exercise_memory, query="", top_k=5),
+            asyncio.to_thread(get_nutrition_memory, query="", top_k=5),
+            asyncio.to_thread(get_wellness_memory, query="", top_k=5)
+        )
         
         timeline_events = []
         
@@ -1776,11 +2245,51 @@ async def get_timeline():
         return {"logs": timeline_events}
         
     except Exception as e:
-        print(f"Timeline Error: {e}")
+        logger.error("Timeline Error: %s", e)
         return {"logs": []}
 
+# Improved regex for finding reps in various formats:
+# - "TOTAL REPS: 5" (from squat/pushup tool)
+# - "performed 5 squats" (from agent prose)
+# - "You completed 4 pushups"
+_REPS_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r"TOTAL REPS:\s*(\d+)",                                   # Tool output format
+    r"performed\s+(\d+)\s+(squats?|pushups?|reps?)",          # "performed 5 squats"
+    r"completed\s+\*?\*?(\d+)\s*\*?\*?\s*(squats?|pushups?|reps?)",  # "completed **5 squats**" or "completed 5 squats"
+    r"You\s+(?:did|performed|completed)\s+(\d+)",             # "You performed 5"
+    r"(\d+)\s+(squats?|pushups?)\s+with",                     # "5 squats with excellent form"
+    r"(\d+)\s+reps?\s+completed",                             # "5 reps completed"
+    r"completed\s+(\d+)\s+reps?",                             # "completed 5 reps"
+    r"Rep\s*count:\s*(\d+)",                                  # "Rep count: 5"
+    r"(\d+)\s+total\s+reps?",                                 # "5 total reps"
+    r"did\s+(\d+)\s+(squats?|pushups?|reps?)",                # "did 5 squats"
+))
+
+# Training sessions block until the CV window closes, so they run on their own small pool
+# instead of pinning a request worker; clients poll /api/trainer/status/{job_id}.
+# Jobs live in this process's memory: this assumes a single server worker (the session also
+# opens the webcam window on this machine). With several workers a poll landing on another
+# worker gets a 404, so run uvicorn with one worker or route trainer calls stickily.
+_TRAINER_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="trainer")
+atexit.register(_TRAINER_POOL.shutdown, wait=False)
+TRAINER_JOB_TTL = 600  # Seconds a finished session's result is kept waiting for a poll
+_TRAINER_JOBS = {}  # job_id -> {"future": Future, "finished_at": monotonic time or None}
+
+def _track_trainer_job(job_id: str, future):
+    """Register a submitted session and stamp it when it finishes (for TTL eviction)."""
+    job = _TRAINER_JOBS[job_id] = {"future": future, "finished_at": None}
+    future.add_done_callback(lambda _: job.update(finished_at=time.monotonic()))
+
+def _prune_trainer_jobs():
+    """Forget finished sessions nobody polled within TRAINER_JOB_TTL (running ones are kept)."""
+    cutoff = time.monotonic() - TRAINER_JOB_TTL
+    for job_id, job in list(_TRAINER_JOBS.items()):
+        finished_at = job["finished_at"]
+        if finished_at is not None and finished_at < cutoff:
+            _TRAINER_JOBS.pop(job_id, None)
+
 @app.post("/api/trainer/start")
-def start_training_session(request: SessionRequest):
+async def start_training_session(request: SessionRequest):
     exercise_choice = request.exercise_type
     user_id = request.user_id
     
@@ -1794,51 +2303,82 @@ def start_training_session(request: SessionRequest):
 
     # reset stop signal
     session_state.clear_stop_signal()
-        
+    
+    _prune_trainer_jobs()
+    job_id = uuid.uuid4().hex
+    _track_trainer_job(job_id, _TRAINER_POOL.submit(_run_training_session, exercise_choice, user_id, api_key))
+    logger.info("[INFO] Training session queued: %s", job_id)
+    
+    return {"status": "started", "job_id": job_id}
+
+@app.get("/api/trainer/status/{job_id}")
+async def get_training_session_status(job_id: str):
+    """
+    Poll a training session started via /api/trainer/start.
+    Returns {"status": "running"} until the session finishes, then the session result (once).
+    Results not collected within TRAINER_JOB_TTL seconds of finishing are dropped (404).
+    """
+    _prune_trainer_jobs()
+    job = _TRAINER_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown training session.")
+    
+    future = job["future"]
+    
+    if not future.done():
+        return {"status": "running", "job_id": job_id}
+    
+    # Finished: hand the result over and forget the job
+    _TRAINER_JOBS.pop(job_id, None)
+    error = future.exception()
+    if isinstance(error, HTTPException):
+        raise error
+    if error is not None:
+        raise HTTPException(status_code=500, detail=str(error))
+    return future.result()
+
+def _run_training_session(exercise_choice: str, user_id: str, api_key: str) -> dict:
+    """Run one CV training session end to end (blocking) and build the session response."""
+    from backend.agents.physical_trainer.agent import PhysicalTrainerAgent
+    from backend.agents.physical_trainer.tasks import PhysicalTrainerTasks
+    
     try:
         # 1. Initialize Agents & Tasks
-        print(f"🚀 Starting session for {exercise_choice}...")
-        print(f"📋 API Key found: {'Yes' if api_key else 'No'}")
+        logger.info("[INFO] Starting session for %s...", exercise_choice)
+        logger.info("[INFO] API Key found: %s", 'Yes' if api_key else 'No')
         
         try:
             pt_agent_manager = PhysicalTrainerAgent()
-            print("✅ PhysicalTrainerAgent instantiated")
+            logger.info("[OK] PhysicalTrainerAgent instantiated")
         except Exception as e:
-            print(f"❌ Failed to create PhysicalTrainerAgent: {e}")
+            logger.error("[ERR] Failed to create PhysicalTrainerAgent: %s", e)
             raise HTTPException(status_code=500, detail=f"Agent creation failed: {e}")
             
         try:
             pt_tasks_manager = PhysicalTrainerTasks()
-            print("✅ PhysicalTrainerTasks instantiated")
+            logger.info("[OK] PhysicalTrainerTasks instantiated")
         except Exception as e:
-            print(f"❌ Failed to create PhysicalTrainerTasks: {e}")
+            logger.error("[ERR] Failed to create PhysicalTrainerTasks: %s", e)
             raise HTTPException(status_code=500, detail=f"Task creation failed: {e}")
 
         try:
-            pt_agent = pt_agent_manager.create(user_id=user_id)
-            print(f"✅ Agent created successfully for user: {user_id}")
+            pt_agent = pt_agent_manager.create(user_id=user_id, verbose=False)
+            logger.info("[OK] Agent created successfully for user: %s", user_id)
         except Exception as e:
-            print(f"❌ Failed to call create(): {e}")
+            logger.error("[ERR] Failed to call create(): %s", e)
             raise HTTPException(status_code=500, detail=f"Agent.create() failed: {e}")
             
         task = pt_tasks_manager.technical_workout_task(pt_agent, exercise_choice)
-        print("✅ Task created successfully")
-
-        crew = Crew(
-            agents=[pt_agent],
-            tasks=[task],
-            process=Process.sequential,
-            verbose=True
-        )
+        logger.info("[OK] Task created successfully")
 
-        # Kickoff the crew (This blocks until the CV window is closed by the user pressing 'q')
-        result_obj = crew.kickoff()
+        # Single agent, single task: execute the task directly instead of wrapping it in a Crew
+        # (This blocks until the CV window is closed by the user pressing 'q')
+        result_obj = task.execute_sync(agent=pt_agent)
         result_text = str(result_obj)
 
         # 2. Parse JSON Output
         data = {}
         try:
-            
             # Extract fields
             data = extract_json(result_text) or {}
             
@@ -1852,7 +2392,6 @@ def start_training_session(request: SessionRequest):
             form_rating = data.get("form_rating", 0)
             
             # Save to Pinecone via Memory Store
-            from backend.tools.memory_store import save_agent_memory
             
             # Create a rich text representation for the memory
             memory_text = f"Completed {exercise_choice} session. Total Reps: {total_reps}. Rating: {form_rating}/10. Issues: {', '.join(detected_issues)}. Summary: {summary}"
@@ -1881,46 +2420,31 @@ def start_training_session(request: SessionRequest):
 
             
         except (json.JSONDecodeError, ValueError):
-            print("⚠️ Warning: Agent output was not valid JSON. Falling back to text parsing.")
-            print(f"📝 Agent output preview: {result_text[:500]}...")  # Debug: show first 500 chars
+            logger.warning("[WARN] Warning: Agent output was not valid JSON. Falling back to text parsing.")
+            logger.info("[INFO] Agent output preview: %s...", result_text[:500])  # Debug: show first 500 chars
             summary = result_text
             total_reps = 0
             detected_issues = []
             recommendations = ""
             form_rating = 5  # Default to neutral rating
             
-            # Improved regex for finding reps in various formats:
-            # - "TOTAL REPS: 5" (from squat/pushup tool)
-            # - "performed 5 squats" (from agent prose)
-            # - "You completed 4 pushups"
-            reps_patterns = [
-                r"TOTAL REPS:\s*(\d+)",                                   # Tool output format
-                r"performed\s+(\d+)\s+(squats?|pushups?|reps?)",          # "performed 5 squats"
-                r"completed\s+\*?\*?(\d+)\s*\*?\*?\s*(squats?|pushups?|reps?)",  # "completed **5 squats**" or "completed 5 squats"
-                r"You\s+(?:did|performed|completed)\s+(\d+)",             # "You performed 5"
-                r"(\d+)\s+(squats?|pushups?)\s+with",                     # "5 squats with excellent form"
-                r"(\d+)\s+reps?\s+completed",                             # "5 reps completed"
-                r"completed\s+(\d+)\s+reps?",                             # "completed 5 reps"
-                r"Rep\s*count:\s*(\d+)",                                  # "Rep count: 5"
-                r"(\d+)\s+total\s+reps?",                                 # "5 total reps"
-                r"did\s+(\d+)\s+(squats?|pushups?|reps?)",                # "did 5 squats"
-            ]
-            
-            for pattern in reps_patterns:
-                reps_match = re.search(pattern, result_text, re.IGNORECASE)
+            # Reps patterns are precompiled at module level (_REPS_PATTERNS), tried in priority order
+            for pattern in _REPS_PATTERNS:
+                reps_match = pattern.search(result_text)
                 if reps_match:
                     total_reps = int(reps_match.group(1))
-                    print(f"📊 Extracted reps: {total_reps} (pattern: {pattern})")
+                    logger.info("[INFO] Extracted reps: %s (pattern: %s)", total_reps, pattern.pattern)
                     break
             
-            # Check for common issues in the text
-            if "valgus" in result_text.lower(): detected_issues.append("knee_valgus")
-            if "sag" in result_text.lower() or "sagging" in result_text.lower(): detected_issues.append("hip_sag")
-            if "shallow" in result_text.lower(): detected_issues.append("shallow_depth")
-            if "lean" in result_text.lower() or "forward lean" in result_text.lower(): detected_issues.append("forward_lean")
+            # Check for common issues in the text (lowercased once)
+            result_lower = result_text.lower()
+            if "valgus" in result_lower: detected_issues.append("knee_valgus")
+            if "sag" in result_lower: detected_issues.append("hip_sag")
+            if "shallow" in result_lower: detected_issues.append("shallow_depth")
+            if "lean" in result_lower: detected_issues.append("forward_lean")
             
             # Simple form rating heuristic
-            if "good" in result_text.lower() and ("form" in result_text.lower() or "depth" in result_text.lower()):
+            if "good" in result_lower and ("form" in result_lower or "depth" in result_lower):
                 form_rating = 8
             if len(detected_issues) > 0:
                 form_rating = max(3, 7 - len(detected_issues))
@@ -1931,14 +2455,9 @@ def start_training_session(request: SessionRequest):
         log_id = "" # Initialize log_id
         
         try:
-            print("... Saving session log to Pinecone Cloud ...")
-            pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-            index = pc.Index(os.environ["PINECONE_INDEX_NAME"])
-            
-            embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/text-embedding-004",
-                google_api_key=api_key
-            )
+            logger.info("... Saving session log to Pinecone Cloud ...")
+            index = _get_index()
+            embeddings = _get_embeddings()
             
             # Create a log entry
             timestamp = int(time.time())
@@ -1953,6 +2472,7 @@ def start_training_session(request: SessionRequest):
                 "issues": detected_issues, # List[str] supported by Pinecone
                 "rating": form_rating,
                 "date": time.strftime('%Y-%m-%d'),
+                "timestamp": timestamp, # Numeric recency key for get_latest_trainer_log
                 "raw_json": json.dumps(data) # Store full object for later retrieval if needed
             }
             
@@ -1963,13 +2483,16 @@ def start_training_session(request: SessionRequest):
                 "values": vector_values,
                 "metadata": metadata
             }])
-            print(f"✅ Successfully saved log {log_id} to Pinecone.")
+            logger.info("[OK] Successfully saved log %s to Pinecone.", log_id)
             save_status = "success"
             
         except Exception as db_err:
-            print(f"⚠️ Warning: Failed to save log to Pinecone: {str(db_err)}")
+            logger.warning("[WARN] Warning: Failed to save log to Pinecone: %s", db_err)
             save_status = "failed"
             save_error = str(db_err)
+        
+        # The session wrote new exercise memory, so cached chat answers ("how were my squats?") are stale
+        chat_response_cache.clear_user(user_id)
 
         # Prepare normalized data for chat wrapper
         trainer_output_normalized = {
@@ -2003,7 +2526,7 @@ def start_training_session(request: SessionRequest):
         }
 
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/api/scan")
@@ -2029,15 +2552,14 @@ async def scan_food(file: UploadFile = File(...)):
             "readiness": wellness_data.get("readiness", "Good"),
         }
         
-        print(f"📋 NutriScan using profile: {user_profile}")
+        logger.info("[INFO] NutriScan using profile: %s", user_profile)
         
         # Call the function from your uploaded scanner.py
+        from backend.agents.nutritionist.scanner import analyze_food_image
         analysis = analyze_food_image(contents, user_profile)
         
         # [INTEGRATION] Save scan result to agent memory so Nutritionist can recall it
         try:
-            from backend.tools.memory_store import save_agent_memory
-            
             # Create a summary string for the memory
             product_name = analysis.get('productName', 'Unknown Food')
             nutrition = analysis.get('nutrition', {})
@@ -2054,9 +2576,9 @@ async def scan_food(file: UploadFile = File(...)):
                     "score": health_score
                 }
             )
-            print(f"✅ Saved scanned food '{product_name}' to memory.")
+            logger.info("[OK] Saved scanned food '%s' to memory.", product_name)
         except Exception as mem_err:
-            print(f"⚠️ Could not save scan to memory: {mem_err}")
+            logger.warning("[WARN] Could not save scan to memory: %s", mem_err)
 
         return analysis
     except Exception as e:
@@ -2071,7 +2593,7 @@ async def get_manager_conflicts(user_id: str):
     try:
         from backend.agents.manager_agent import generate_daily_briefing
         
-        print(f"🎯 Manager Agent generating daily briefing for user: {user_id}")
+        logger.info("[INFO] Manager Agent generating daily briefing for user: %s", user_id)
         
         # Generate real briefing using agent orchestration
         briefing = generate_daily_briefing(user_id)
@@ -2147,13 +2669,11 @@ async def get_manager_conflicts(user_id: str):
                 }
             }
         
-        print(f"✅ Daily briefing generated: {briefing['final_decision']['summary']}")
+        logger.info("[OK] Daily briefing generated: %s", briefing['final_decision']['summary'])
         return response
         
     except Exception as e:
-        print(f"❌ Error generating daily briefing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[ERR] Error generating daily briefing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -2166,8 +2686,8 @@ async def regenerate_manager_briefing(request: ManagerRegenerateRequest):
     try:
         from backend.agents.manager_agent import generate_daily_briefing
         
-        print(f"🔄 Regenerating manager briefing for user: {request.user_id}")
-        print(f"📝 User suggestions: {request.suggestions}")
+        logger.info("[INFO] Regenerating manager briefing for user: %s", request.user_id)
+        logger.info("[INFO] User suggestions: %s", request.suggestions)
         
         # Generate briefing with user suggestions
         briefing = generate_daily_briefing(
@@ -2242,13 +2762,11 @@ async def regenerate_manager_briefing(request: ManagerRegenerateRequest):
                 }
             }
         
-        print(f"✅ Regenerated briefing: {briefing['final_decision']['summary']}")
+        logger.info("[OK] Regenerated briefing: %s", briefing['final_decision']['summary'])
         return response
         
     except Exception as e:
-        print(f"❌ Error regenerating briefing: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("[ERR] Error regenerating briefing: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -2256,7 +2774,7 @@ async def regenerate_manager_briefing(request: ManagerRegenerateRequest):
 async def stop_training_session():
     """Signals the running trainer session to stop."""
     session_state.set_stop_signal()
-    print("🛑 Stop signal sent to trainer session.")
+    logger.info("[INFO] Stop signal sent to trainer session.")
     return {"status": "success", "message": "Stop signal sent"}
 
 if __name__ == "__main__":
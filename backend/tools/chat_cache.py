@@ -0,0 +1,118 @@
+"""
+Response cache for the chat agents (Trainer, Nutritionist, Wellness Coach).
+
+Two tiers per (agent, user):
+- Exact: normalized message text -> cached response
+- Semantic: cosine similarity of the message embedding against recently answered
+  messages; a close enough match (default >= 0.95) reuses that answer
+
+The message embedding comes from memory_store's LRU-cached `_embed_query`, i.e. the
+same vector the agents' Pinecone lookups use, so checking the cache costs no extra
+embedding call. Entries expire after a TTL because workout/wellness memory changes.
+"""
+
+import time
+import threading
+import numpy as np
+from backend.tools.memory_store import _embed_query
+
+
+def message_vector(message: str):
+    """Embedding of a chat message via memory_store's LRU (None if embedding is unavailable)."""
+    try:
+        return _embed_query(message)
+    except Exception as e:
+        print(f"⚠️ Chat cache could not embed message: {e}")
+        return None
+
+
+def _normalize(message: str) -> str:
+    """Whitespace/case-normalized message text (the exact-match key)."""
+    return " ".join(message.split()).lower()
+
+
+class _UserRing:
+    """Fixed-size FIFO of (message, embedding, response) for one agent/user pair."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.vectors = None  # (capacity, dim) float32, L2-normalized rows; allocated on first put
+        self.stamps = np.full(capacity, -np.inf)  # insert time per slot (-inf = empty)
+        self.messages = [None] * capacity
+        self.responses = [None] * capacity
+        self.slot_by_message = {}
+        self.next_slot = 0
+
+
+class ChatResponseCache:
+    def __init__(self, ttl: float = 1800, capacity: int = 256, threshold: float = 0.95):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.threshold = threshold
+        self._rings = {}
+        self._lock = threading.Lock()
+
+    def get(self, agent: str, user_id: str, message: str, vector=None):
+        """Cached response for this message (exact, then semantic), or None."""
+        with self._lock:
+            ring = self._rings.get((agent, user_id))
+            if ring is None:
+                return None
+            live = ring.stamps >= time.time() - self.ttl
+
+            # 1. Exact tier
+            slot = ring.slot_by_message.get(_normalize(message))
+            if slot is not None and live[slot]:
+                return ring.responses[slot]
+
+            # 2. Semantic tier (one matrix-vector product over the recent messages)
+            if vector is None or ring.vectors is None or not live.any():
+                return None
+            query = np.asarray(vector, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if not norm:
+                return None
+            scores = ring.vectors @ (query / norm)
+            scores[~live] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return ring.responses[best]
+            return None
+
+    def put(self, agent: str, user_id: str, message: str, vector, response: dict):
+        """Remember a successful response, overwriting the oldest slot when full."""
+        key = _normalize(message)
+        with self._lock:
+            ring = self._rings.get((agent, user_id))
+            if ring is None:
+                ring = self._rings[(agent, user_id)] = _UserRing(self.capacity)
+
+            slot = ring.next_slot
+            ring.next_slot = (slot + 1) % ring.capacity
+            old_key = ring.messages[slot]
+            if old_key is not None and ring.slot_by_message.get(old_key) == slot:
+                del ring.slot_by_message[old_key]
+
+            if vector is not None:
+                vec = np.asarray(vector, dtype=np.float32)
+                if ring.vectors is None:
+                    ring.vectors = np.zeros((ring.capacity, vec.shape[0]), dtype=np.float32)
+                norm = np.linalg.norm(vec)
+                ring.vectors[slot] = vec / norm if norm else 0.0
+            elif ring.vectors is not None:
+                ring.vectors[slot] = 0.0  # exact-only entry: never a semantic match
+
+            ring.stamps[slot] = time.time()
+            ring.messages[slot] = key
+            ring.responses[slot] = response
+            ring.slot_by_message[key] = slot
+
+    def clear_user(self, user_id: str):
+        """Drop every agent's cached responses for a user (e.g. after a profile change)."""
+        with self._lock:
+            for ring_key in [k for k in self._rings if k[1] == user_id]:
+                del self._rings[ring_key]
+
+
+# Shared by the API server and the wellness brain
+chat_response_cache = ChatResponseCache()
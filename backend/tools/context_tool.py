@@ -1,7 +1,5 @@
-import os
 from crewai.tools import BaseTool
-from pinecone import Pinecone
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from backend.tools.memory_store import _get_index, _embed_query
 
 class FitnessHistoryTool(BaseTool):
     name: str = "FitnessHistoryRAG"
@@ -15,17 +13,11 @@ class FitnessHistoryTool(BaseTool):
         print(f"📊 [FitnessHistoryTool] Called with query: '{query[:50]}...'", flush=True)
         print(f"📊 [FitnessHistoryTool] User ID (namespace): {self.user_id}", flush=True)
         try:
-            # 1. Setup Connection
-            pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-            index = pc.Index(os.environ["PINECONE_INDEX_NAME"])
+            # 1. Setup Connection (shared process-wide index handle)
+            index = _get_index()
             
-            # 2. Convert Query -> Vector
-            api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-            embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/text-embedding-004",
-                google_api_key=api_key
-            )
-            query_vector = embeddings.embed_query(query)
+            # 2. Convert Query -> Vector (shared embeddings client, LRU-cached per query)
+            query_vector = _embed_query(query)
             
             # 3. Search Cloud DB
             print(f"📊 [FitnessHistoryTool] Querying Pinecone with namespace='{self.user_id}'", flush=True)
@@ -13,6 +13,7 @@ import os
 import time
 import json
 import hashlib
+from functools import lru_cache
 from pinecone import Pinecone
 from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from dotenv import load_dotenv
@@ -43,33 +44,34 @@ def get_namespace_id(user_id: str) -> str:
 
 
 # Global caches for performance optimization
-_embeddings_instance = None
-_embedding_cache = {}
 _profile_query_vector = None
 
+# Task type for batched embed_documents writes. Every other writer and every search uses
+# embed_query (RETRIEVAL_QUERY), so batches must ask for the same task type to keep one
+# vector space per namespace (embed_documents would default to RETRIEVAL_DOCUMENT).
+EMBEDDING_TASK_TYPE = "RETRIEVAL_QUERY"
 
+
+@lru_cache(maxsize=1)
 def _get_embeddings():
     """Get the embedding model instance (singleton pattern)."""
-    global _embeddings_instance
-    if _embeddings_instance is None:
-        api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-        _embeddings_instance = GoogleGenerativeAIEmbeddings(
-            model="models/text-embedding-004",
-            google_api_key=api_key
-        )
-    return _embeddings_instance
+    api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
+    return GoogleGenerativeAIEmbeddings(
+        model="models/text-embedding-004",
+        google_api_key=api_key
+    )
 
 
+@lru_cache(maxsize=1024)
 def _get_cached_embedding(text: str):
-    """Get embedding with caching for repeated queries."""
-    global _embedding_cache
-    if text in _embedding_cache:
-        return _embedding_cache[text]
-    
+    """Get embedding with caching for repeated queries (bounded LRU)."""
     embeddings = _get_embeddings()
-    vector = embeddings.embed_query(text)
-    _embedding_cache[text] = vector
-    return vector
+    return embeddings.embed_query(text)
+
+
+def _embed_query(text: str):
+    """Embed a search query through the LRU cache, keyed on whitespace/case-normalized text."""
+    return _get_cached_embedding(" ".join(text.split()).lower())
 
 
 def get_profile_query_vector():
@@ -81,8 +83,9 @@ def get_profile_query_vector():
     return _profile_query_vector
 
 
+@lru_cache(maxsize=1)
 def _get_index():
-    """Get the Pinecone index instance."""
+    """Get the Pinecone index instance (created once per process)."""
     pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
     return pc.Index(os.environ["PINECONE_INDEX_NAME"])
 
@@ -140,6 +143,72 @@ def save_agent_memory(agent_type: str, content: str, metadata: dict = None, user
         return None
 
 
+def save_agent_memories_batch(entries: list) -> list:
+    """
+    Save several agent outputs with one embedding call and one upsert per namespace.
+    
+    Args:
+        entries: List of dicts with the save_agent_memory arguments:
+            agent_type, content, and optional metadata / user_id
+            
+    Returns:
+        The log IDs of the saved records in input order (None for each entry on failure)
+    """
+    if not entries:
+        return []
+    
+    try:
+        index = _get_index()
+        embeddings = _get_embeddings()
+        
+        timestamp = int(time.time())
+        date_str = time.strftime('%Y-%m-%d')
+        
+        # One round-trip for every embedding
+        vectors_values = embeddings.embed_documents(
+            [entry["content"] for entry in entries],
+            task_type=EMBEDDING_TASK_TYPE
+        )
+        
+        log_ids = []
+        vectors_by_namespace = {}
+        for i, (entry, vector_values) in enumerate(zip(entries, vectors_values)):
+            agent_type = entry["agent_type"]
+            content = entry["content"]
+            
+            # Entries share a timestamp, so suffix the position to keep IDs unique
+            log_id = f"{agent_type}_{timestamp}_{i}"
+            
+            # Build metadata
+            full_metadata = {
+                "agent_type": agent_type,
+                "text": content[:1000],  # Pinecone metadata limit
+                "date": date_str,
+                "timestamp": timestamp
+            }
+            if entry.get("metadata"):
+                full_metadata.update(entry["metadata"])
+            
+            namespace = get_namespace_id(entry.get("user_id", "user_123"))  # Hashed for security
+            vectors_by_namespace.setdefault(namespace, []).append({
+                "id": log_id,
+                "values": vector_values,
+                "metadata": full_metadata
+            })
+            log_ids.append(log_id)
+        
+        # UPSERT WITH NAMESPACE (one call per namespace)
+        for namespace, vectors in vectors_by_namespace.items():
+            index.upsert(vectors=vectors, namespace=namespace)
+        
+        print(f"✅ Saved {len(log_ids)} memories in one batch")
+        return log_ids
+        
+    except Exception as e:
+        print(f"❌ Error saving memory batch: {e}")
+        return [None] * len(entries)
+
+
 def get_exercise_memory(query: str = "recent workout session", top_k: int = 3, user_id: str = "user_123") -> list:
     """
     Retrieve exercise/trainer memories for the Nutritionist to reference.
@@ -153,9 +222,7 @@ def get_exercise_memory(query: str = "recent workout session", top_k: int = 3, u
     """
     try:
         index = _get_index()
-        embeddings = _get_embeddings()
-        
-        query_vector = embeddings.embed_query(query)
+        query_vector = _embed_query(query)
         
         # Query with filter for trainer logs
         # Support both old format (log_*) and new format (trainer_*)
@@ -206,9 +273,7 @@ def get_nutrition_memory(query: str = "recent meal plan", top_k: int = 3, user_i
     """
     try:
         index = _get_index()
-        embeddings = _get_embeddings()
-        
-        query_vector = embeddings.embed_query(query)
+        query_vector = _embed_query(query)
         
         # Query with filter for nutritionist logs
         results = index.query(
@@ -301,13 +366,12 @@ def get_wellness_memory(query: str = "recent wellness biometric analysis", top_k
     """
     try:
         index = _get_index()
-        embeddings = _get_embeddings()
         
         namespace = get_namespace_id(user_id)
         print(f"🔍 Querying wellness data for user: {user_id}")
         print(f"   Namespace (hashed): {namespace[:16]}...")
         
-        query_vector = embeddings.embed_query(query)
+        query_vector = _embed_query(query)
         
         # Query Pinecone - fetch more to ensure we get all wellness logs
         results = index.query(
@@ -402,10 +466,8 @@ def get_training_plan_memory(user_id: str = "user_123", top_k: int = 1) -> dict:
     """
     try:
         index = _get_index()
-        embeddings = _get_embeddings()
-        
         # Query for training plans
-        query_vector = embeddings.embed_query(f"weekly training plan workout program for {user_id}")
+        query_vector = _embed_query(f"weekly training plan workout program for {user_id}")
         
         # Query Pinecone
         results = index.query(
@@ -1,8 +1,6 @@
-import os
 import time
 from crewai.tools import BaseTool
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from pinecone import Pinecone
+from backend.tools.memory_store import _get_index, _get_embeddings
 from pydantic import Field
 
 class SaveNutritionTool(BaseTool):
@@ -15,16 +13,11 @@ class SaveNutritionTool(BaseTool):
 
     def _run(self, plan_summary: str, calories: int, protein: int, carbs: int, fat: int) -> str:
         try:
-            # 1. Connect to Pinecone
-            pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-            index = pc.Index(os.environ["PINECONE_INDEX_NAME"])
-
-            # 2. Embed the Text
-            embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/text-embedding-004",
-                google_api_key=os.environ["GOOGLE_API_KEY"]
-            )
-            vector_values = embeddings.embed_query(plan_summary)
+            # 1. Connect to Pinecone (shared process-wide index handle)
+            index = _get_index()
+
+            # 2. Embed the Text (shared embeddings client)
+            vector_values = _get_embeddings().embed_query(plan_summary)
 
             # 3. Create Record
             timestamp = int(time.time())
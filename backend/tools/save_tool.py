@@ -3,7 +3,15 @@ import datetime
 import uuid
 from crewai.tools import BaseTool
 from pinecone import Pinecone
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from functools import lru_cache
+from backend.tools.memory_store import _get_embeddings
+
+
+@lru_cache(maxsize=1)
+def _get_workout_index():
+    """Get the Pinecone index for workout logs (created once per process)."""
+    pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
+    return pc.Index(os.environ.get("PINECONE_INDEX_NAME", "fitness-memory"))
 
 class SaveWorkoutTool(BaseTool):
     name: str = "SaveWorkoutToCloud"
@@ -15,17 +23,11 @@ class SaveWorkoutTool(BaseTool):
 
     def _run(self, workout_summary: str) -> str:
         try:
-            # 1. Init Pinecone
-            pc = Pinecone(api_key=os.environ["PINECONE_API_KEY"])
-            index = pc.Index(os.environ.get("PINECONE_INDEX_NAME", "fitness-memory"))
-
-            # 2. Init Embeddings (Must match your reading tool)
-            # Use GEMINI_API_KEY as fallback if GOOGLE_API_KEY not set
-            api_key = os.environ.get("GOOGLE_API_KEY") or os.environ.get("GEMINI_API_KEY")
-            embeddings = GoogleGenerativeAIEmbeddings(
-                model="models/text-embedding-004",
-                google_api_key=api_key
-            )
+            # 1. Init Pinecone (created once per process)
+            index = _get_workout_index()
+
+            # 2. Init Embeddings (Must match your reading tool; shared singleton)
+            embeddings = _get_embeddings()
 
             # 3. Prepare Data
             timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
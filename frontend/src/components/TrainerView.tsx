@@ -460,7 +460,19 @@ const TrainerView: React.FC = () => {
         throw new Error(errData.detail || 'Failed to start session');
       }
 
-      const data = await response.json();
+      // The session runs in the background; poll until it finishes
+      const { job_id } = await response.json();
+      let data: any;
+      while (true) {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const statusResponse = await fetch(`/api/trainer/status/${job_id}`);
+        if (!statusResponse.ok) {
+          const errData = await statusResponse.json();
+          throw new Error(errData.detail || 'Session failed');
+        }
+        data = await statusResponse.json();
+        if (data.status !== 'running') break;
+      }
 
       setTotalReps(data.total_reps);
       setDetectedIssues(data.detected_issues || []);